@@ -9,6 +9,7 @@ from .utils.dependency_injection import container
 from .utils.config_manager import ConfigManager
 from .utils.logger_setup import setup_logging
 from .service.ollama_service import OllamaService, OllamaServiceInterface
+from .service.batch_scheduler import BatchScheduler
 from .processors.content_processor import ContentProcessor
 
 logger = logging.getLogger('accessibility_assistant.bootstrap')
@@ -50,6 +51,9 @@ class ApplicationBootstrap:
             # Register content processor as singleton
             container.register_singleton(ContentProcessor, ContentProcessor)
             
+            # Register batch scheduler for multi-document summarization
+            container.register_singleton(BatchScheduler, BatchScheduler)
+            
             logger.info("Dependency injection container configured successfully")
             
         except Exception as e:
@@ -87,6 +91,15 @@ class ApplicationBootstrap:
         """
         return container.get(OllamaService)
     
+    def get_batch_scheduler(self) -> BatchScheduler:
+        """
+        Get the batch scheduler instance
+        
+        Returns:
+            BatchScheduler instance
+        """
+        return container.get(BatchScheduler)
+    
     def health_check(self) -> bool:
         """
         Perform application health check
@@ -8,6 +8,8 @@ import tempfile
 import os
 import logging
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 
@@ -30,6 +32,7 @@ class VideoProcessor:
     def __init__(self, config_manager: ConfigManager):
         self.config = config_manager
         self._whisper_model = None
+        self._model_lock = threading.Lock()
         self._setup_whisper()
         
     def _setup_whisper(self):
@@ -48,10 +51,49 @@ class VideoProcessor:
     def whisper_model(self):
         """Lazy load Whisper model"""
         if self._whisper_model is None:
-            model_size = self.config.get('ai', 'whisper_model', 'base')
-            logger.info(f"Loading Whisper model: {model_size}")
-            self._whisper_model = whisper.load_model(model_size)
+            with self._model_lock:
+                if self._whisper_model is None:
+                    model_size = self.config.get('ai', 'whisper_model', 'base')
+                    whisper_config = self.config.get('ai', 'whisper', {})
+                    backend = whisper_config.get('backend', 'openai')
+                    logger.info(f"Loading Whisper model: {model_size} ({backend} backend)")
+                    self._whisper_model = self._load_whisper_backend(backend, model_size, whisper_config)
         return self._whisper_model
+
+    def _load_whisper_backend(self, backend: str, model_size: str, whisper_config: dict):
+        """
+        Load Whisper for the configured backend, falling back to openai-whisper
+
+        Args:
+            backend: Backend name ('openai', 'onnx' or 'openvino')
+            model_size: Whisper model size
+            whisper_config: 'whisper' section of the AI configuration
+
+        Returns:
+            Model object exposing transcribe()
+        """
+        if backend == 'onnx':
+            try:
+                from .whisper_backends import ONNXWhisperModel
+                return ONNXWhisperModel(
+                    model_size,
+                    cache_dir=whisper_config.get('onnx_cache_dir'),
+                    provider=whisper_config.get('onnx_provider', 'CUDAExecutionProvider')
+                )
+            except Exception as e:
+                logger.warning(f"ONNX Whisper backend unavailable, using openai-whisper: {e}")
+        elif backend == 'openvino':
+            try:
+                from .whisper_backends import OpenVINOWhisperModel
+                return OpenVINOWhisperModel(
+                    whisper_config['openvino_model_dir'],
+                    device=whisper_config.get('openvino_device', 'GPU'),
+                    cache_dir=whisper_config.get('openvino_cache_dir')
+                )
+            except Exception as e:
+                logger.warning(f"OpenVINO Whisper backend unavailable, using openai-whisper: {e}")
+
+        return whisper.load_model(model_size)
     
     def extract_content(self, file_path: str) -> str:
         """
@@ -68,8 +110,19 @@ class VideoProcessor:
         try:
             logger.info(f"Starting video processing for: {file_path}")
             
-            # Extract audio from video
-            temp_audio_path = self._extract_audio(file_path)
+            # Extract audio while the Whisper model loads (first call only pays the load)
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                audio_future = executor.submit(self._extract_audio, file_path)
+                model_future = executor.submit(lambda: self.whisper_model)
+                # An audio failure is the error raised; a model load failure is only logged alongside it
+                audio_error = audio_future.exception()
+                if audio_error is not None:
+                    model_error = model_future.exception()
+                    if model_error is not None:
+                        logger.error(f"Whisper model load also failed: {model_error}")
+                    raise audio_error
+                temp_audio_path = audio_future.result()
+                model_future.result()
             
             # Transcribe audio to text
             transcript = self._transcribe_audio(temp_audio_path)
@@ -0,0 +1,132 @@
+"""
+Alternative Whisper inference backends
+Adapters expose the same transcribe() result shape as openai-whisper
+"""
+
+import logging
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger('accessibility_assistant.whisper_backends')
+
+SAMPLE_RATE = 16000
+CHUNK_SECONDS = 30
+DEFAULT_CACHE_ROOT = Path.home() / ".cache" / "prism"
+
+
+class ONNXWhisperModel:
+    """
+    Whisper served through ONNX Runtime
+    On the CUDA provider inputs, outputs and KV-cache states are bound to
+    device buffers so decoder steps avoid host/device copies
+    """
+
+    def __init__(self, model_size: str, cache_dir: Optional[str] = None,
+                 provider: str = 'CUDAExecutionProvider'):
+        # Optional dependencies - only needed when the onnx backend is selected
+        from optimum.onnxruntime import ORTModelForSpeechSeq2Seq
+        from transformers import WhisperProcessor
+
+        model_id = f"openai/whisper-{model_size}"
+        export_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_ROOT / "onnx_whisper"
+        export_dir = export_dir / model_size
+
+        self.use_io_binding = provider == 'CUDAExecutionProvider'
+        self.device = 'cuda' if self.use_io_binding else 'cpu'
+
+        if (export_dir / "config.json").exists():
+            # Reuse the ONNX graph exported on a previous run
+            self.model = ORTModelForSpeechSeq2Seq.from_pretrained(
+                export_dir, provider=provider, use_io_binding=self.use_io_binding
+            )
+        else:
+            logger.info(f"Exporting {model_id} to ONNX (first run only): {export_dir}")
+            self.model = ORTModelForSpeechSeq2Seq.from_pretrained(
+                model_id, export=True, provider=provider, use_io_binding=self.use_io_binding
+            )
+            self.model.save_pretrained(export_dir)
+
+        self.processor = WhisperProcessor.from_pretrained(model_id)
+        logger.info(f"ONNX Whisper ready: {model_id} on {provider}")
+
+    def transcribe(self, audio_path: str, **kwargs) -> Dict[str, Any]:
+        """
+        Transcribe audio file in 30 second windows
+
+        Args:
+            audio_path: Path to audio file
+            **kwargs: openai-whisper options (accepted for compatibility, ignored)
+
+        Returns:
+            Dictionary with 'text' and 'segments' like whisper.transcribe
+        """
+        import whisper  # load_audio resamples to 16kHz mono via ffmpeg
+
+        audio = whisper.load_audio(audio_path)
+        window = SAMPLE_RATE * CHUNK_SECONDS
+        segments = []
+
+        for offset in range(0, len(audio), window):
+            chunk = audio[offset:offset + window]
+            features = self.processor(
+                chunk, sampling_rate=SAMPLE_RATE, return_tensors='pt'
+            ).input_features.to(self.device)
+
+            token_ids = self.model.generate(features)
+            text = self.processor.batch_decode(token_ids, skip_special_tokens=True)[0].strip()
+
+            if text:
+                segments.append({
+                    'start': offset / SAMPLE_RATE,
+                    'end': (offset + len(chunk)) / SAMPLE_RATE,
+                    'text': text
+                })
+
+        return {
+            'text': ' '.join(segment['text'] for segment in segments),
+            'segments': segments
+        }
+
+
+class OpenVINOWhisperModel:
+    """
+    Whisper served through OpenVINO GenAI on Intel CPU/GPU/NPU
+    Compiled device blobs are cached so restarts skip compilation
+    """
+
+    def __init__(self, model_dir: str, device: str = 'GPU', cache_dir: Optional[str] = None):
+        # Optional dependency - only needed when the openvino backend is selected
+        import openvino_genai as ov_genai
+
+        blob_cache = Path(cache_dir) if cache_dir else DEFAULT_CACHE_ROOT / "ov_whisper"
+        blob_cache.mkdir(parents=True, exist_ok=True)
+
+        self.pipeline = ov_genai.WhisperPipeline(
+            str(model_dir), device, CACHE_DIR=str(blob_cache)
+        )
+        logger.info(f"OpenVINO Whisper ready: {model_dir} on {device} (cache: {blob_cache})")
+
+    def transcribe(self, audio_path: str, **kwargs) -> Dict[str, Any]:
+        """
+        Transcribe audio file
+
+        Args:
+            audio_path: Path to audio file
+            **kwargs: openai-whisper options (accepted for compatibility, ignored)
+
+        Returns:
+            Dictionary with 'text' and 'segments' like whisper.transcribe
+        """
+        import whisper  # load_audio resamples to 16kHz mono via ffmpeg
+
+        audio = whisper.load_audio(audio_path)
+        result = self.pipeline.generate(audio.tolist(), return_timestamps=True)
+
+        segments = [
+            {'start': chunk.start_ts, 'end': chunk.end_ts, 'text': chunk.text.strip()}
+            for chunk in (result.chunks or [])
+            if chunk.text.strip()
+        ]
+        text = result.texts[0].strip() if result.texts else ""
+
+        return {'text': text, 'segments': segments}
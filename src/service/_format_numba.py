@@ -0,0 +1,87 @@
+"""
+Numba-compiled bullet normalization for very large summaries
+Optional - requires numba; OllamaService falls back to the regex pass without it
+"""
+
+import numpy as np
+from numba import njit
+
+_HYPHEN = 0x2D
+_ASTERISK = 0x2A
+_SPACE = 0x20
+_TAB = 0x09
+_NEWLINE = 0x0A
+_BULLET = (0xE2, 0x80, 0xA2)  # UTF-8 encoding of '•'
+
+
+@njit(cache=True)
+def _is_blank(buf, i):
+    """True if buf[i] is a space or tab"""
+    return i < len(buf) and (buf[i] == _SPACE or buf[i] == _TAB)
+
+
+@njit(cache=True)
+def _bullet_width(buf, i):
+    """Byte length of the bullet marker at buf[i] (0 if none or already '• ')"""
+    if (buf[i] == _BULLET[0] and i + 2 < len(buf)
+            and buf[i + 1] == _BULLET[1] and buf[i + 2] == _BULLET[2]):
+        # Already normalized lines are left alone
+        return 0 if i + 3 < len(buf) and buf[i + 3] == _SPACE else 3
+    if buf[i] == _HYPHEN:
+        return 1
+    # '*' directly followed by text is emphasis ('**Term**'), not a bullet
+    if buf[i] == _ASTERISK and _is_blank(buf, i + 1):
+        return 1
+    return 0
+
+
+@njit(cache=True)
+def normalize_bullets(buf: np.ndarray) -> np.ndarray:
+    """
+    Rewrite bullet markers at line starts to '• '
+
+    Same result as OllamaService's _BULLET_NORM_RE pass: one marker plus its
+    trailing spaces/tabs is replaced per line.
+
+    Args:
+        buf: UTF-8 text as a uint8 array
+
+    Returns:
+        Normalized UTF-8 text as a uint8 array
+    """
+    n = len(buf)
+    # Worst case is '-\n' (2 bytes) growing to '• \n' (5 bytes)
+    out = np.empty(n * 3 + 4, dtype=np.uint8)
+    i = 0
+    j = 0
+    line_start = True
+
+    while i < n:
+        if line_start:
+            line_start = False
+            width = _bullet_width(buf, i)
+            if width:
+                # Consume the marker and the whitespace after it
+                i += width
+                while _is_blank(buf, i):
+                    i += 1
+                out[j] = _BULLET[0]
+                out[j + 1] = _BULLET[1]
+                out[j + 2] = _BULLET[2]
+                out[j + 3] = _SPACE
+                j += 4
+                continue
+
+        out[j] = buf[i]
+        if buf[i] == _NEWLINE:
+            line_start = True
+        i += 1
+        j += 1
+
+    return out[:j]
+
+
+def normalize_bullets_text(text: str) -> str:
+    """Normalize bullet markers in a str through the compiled kernel"""
+    buf = np.frombuffer(text.encode('utf-8'), dtype=np.uint8)
+    return normalize_bullets(buf).tobytes().decode('utf-8')
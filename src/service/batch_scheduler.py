@@ -0,0 +1,172 @@
+"""
+Batch Scheduler for multi-document summarization
+Groups pending requests into (model, length) bins so each bin is served together
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Deque, Dict, List, Optional, Tuple
+
+from ..utils.dependency_injection import singleton, injectable
+from ..utils.config_manager import ConfigManager
+from .ollama_service import OllamaService, ContentType
+
+logger = logging.getLogger('accessibility_assistant.batch_scheduler')
+
+# Content length bin edges (chars): <1k, 1k-4k, 4k+
+LENGTH_BUCKETS = (1000, 4000)
+
+BinKey = Tuple[str, int]
+PendingItem = Tuple[str, ContentType, Future, float]
+
+
+@singleton
+@injectable
+class BatchScheduler:
+    """
+    Length-binned batch scheduler for Ollama summaries
+
+    Requests are binned by (selected model, length bucket). A worker thread
+    submits a bin once it holds max_batch requests or its oldest request has
+    waited max_wait_ms. With a single loaded model (OLLAMA_MAX_LOADED_MODELS=1)
+    bins for the model already in memory are drained first to avoid e2b/e4b swaps.
+    """
+
+    def __init__(self, config_manager: ConfigManager, ollama_service: OllamaService):
+        self.ollama_service = ollama_service
+
+        batching_config = config_manager.get('ai', 'batching', {})
+        self.max_batch = batching_config.get('max_batch', 4)
+        self.max_wait = batching_config.get('max_wait_ms', 50) / 1000
+        self.max_loaded_models = batching_config.get('max_loaded_models', 1)
+
+        self._bins: Dict[BinKey, Deque[PendingItem]] = {}
+        self._condition = threading.Condition()
+        self._current_model: Optional[str] = None
+        self._running = False
+        self._shut_down = False
+        self._worker: Optional[threading.Thread] = None
+
+    def enqueue(self, content: str, content_type: ContentType) -> Future:
+        """
+        Queue content for summarization
+
+        Args:
+            content: Content to summarize
+            content_type: Type of content
+
+        Returns:
+            Future resolving to the structured summary dictionary
+
+        Raises:
+            RuntimeError: If the scheduler has been shut down
+        """
+        model_name = self.ollama_service._select_model(content_type, len(content))
+        key = (model_name, self._length_bucket(len(content)))
+        future: Future = Future()
+
+        with self._condition:
+            if self._shut_down:
+                raise RuntimeError("BatchScheduler has been shut down")
+            self._bins.setdefault(key, deque()).append((content, content_type, future, time.monotonic()))
+            self._condition.notify()
+            start_worker = not self._running
+            self._running = True
+
+        if start_worker:
+            self._start_worker()
+        return future
+
+    def shutdown(self, wait: bool = True):
+        """Stop the worker after flushing all queued requests; later enqueue calls are rejected"""
+        with self._condition:
+            self._shut_down = True
+            self._running = False
+            self._condition.notify()
+        if wait and self._worker:
+            self._worker.join()
+
+    @staticmethod
+    def _length_bucket(content_length: int) -> int:
+        """Get length bin index for content"""
+        for index, edge in enumerate(LENGTH_BUCKETS):
+            if content_length < edge:
+                return index
+        return len(LENGTH_BUCKETS)
+
+    def _start_worker(self):
+        """Start worker thread on first use, joining any previous worker first"""
+        previous = self._worker
+        if previous is not None and previous.is_alive():
+            # Never run two event loops against the same bins
+            previous.join()
+        self._worker = threading.Thread(target=self._run, name='batch-scheduler', daemon=True)
+        self._worker.start()
+
+    def _next_batch(self) -> Tuple[Optional[BinKey], List[PendingItem]]:
+        """Pop the next ready batch (caller holds the condition)"""
+        now = time.monotonic()
+        ready = [
+            (key, queue) for key, queue in self._bins.items()
+            if queue and (
+                not self._running
+                or len(queue) >= self.max_batch
+                or now - queue[0][3] >= self.max_wait
+            )
+        ]
+        if not ready:
+            return None, []
+
+        if self.max_loaded_models < 2:
+            # Sticky model: loaded model first, then oldest request
+            ready.sort(key=lambda entry: (entry[0][0] != self._current_model, entry[1][0][3]))
+        else:
+            ready.sort(key=lambda entry: entry[1][0][3])
+
+        key, queue = ready[0]
+        batch = [queue.popleft() for _ in range(min(self.max_batch, len(queue)))]
+        return key, batch
+
+    def _time_until_ready(self) -> Optional[float]:
+        """Seconds until the oldest queued request hits max_wait (None if idle)"""
+        now = time.monotonic()
+        waits = [self.max_wait - (now - queue[0][3]) for queue in self._bins.values() if queue]
+        return max(min(waits), 0) if waits else None
+
+    def _run(self):
+        """Worker loop - drains ready bins through the async batch path"""
+        loop = asyncio.new_event_loop()
+        try:
+            while True:
+                with self._condition:
+                    key, batch = self._next_batch()
+                    while not batch:
+                        if not self._running:
+                            return
+                        self._condition.wait(self._time_until_ready())
+                        key, batch = self._next_batch()
+
+                model_name = key[0]
+                if model_name != self._current_model:
+                    logger.info(f"Batch scheduler switching to model {model_name}")
+                    self._current_model = model_name
+
+                items = [(content, content_type) for content, content_type, _, _ in batch]
+                try:
+                    results = loop.run_until_complete(
+                        self.ollama_service.generate_summaries(items, model_name=model_name)
+                    )
+                except Exception as e:
+                    results = [e] * len(batch)
+
+                for (_, _, future, _), result in zip(batch, results):
+                    if isinstance(result, BaseException):
+                        future.set_exception(result)
+                    else:
+                        future.set_result(result)
+        finally:
+            loop.close()
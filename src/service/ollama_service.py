@@ -3,21 +3,138 @@ Ollama Service for AI model interaction
 Handles model selection, initialization, and inference
 """
 
-import ollama
+import hashlib
+import importlib.util
+import json
 import logging
+import os
+import tempfile
 import time
 import re
-from typing import Dict, Any, Optional, List
+import asyncio
+from typing import Dict, Any, Optional, List, Tuple, Iterator, Mapping
 from enum import Enum
 from dataclasses import dataclass
 import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from operator import attrgetter
+from types import SimpleNamespace, MappingProxyType, ModuleType
 from abc import ABC, abstractmethod
+from pathlib import Path
 
 from ..utils.dependency_injection import singleton, injectable
 from ..utils.config_manager import ConfigManager
 
 logger = logging.getLogger('accessibility_assistant.ollama')
 
+# Summary formatting patterns
+_LINE_BREAKS_RE = re.compile(r'[ \t\r]*\n\s*')  # Strips lines and drops blank ones
+# One leading marker plus its whitespace; '• ' lines are already normalized and
+# '*' directly followed by text is emphasis ('**Term**', '*italic*'), not a bullet
+_BULLET_NORM_RE = re.compile(r'^(?!• )(?:[•\-]|\*(?=[ \t]))[ \t]*', re.MULTILINE)
+
+# Summary parsing patterns
+_TERM_TOKEN_RE = re.compile(r'<\|[^|]*\|>')  # Model termination tokens like <|file_separator|>
+_MULTI_NEWLINE_RE = re.compile(r'\n\s*\n+')
+_MD_HEADER_RE = re.compile(r'^#+\s+.*?\n', re.MULTILINE)
+_BULLET_LINE_RE = re.compile(r'(?:[-•*] |\d+\.\s)(.*)')  # Marker is followed by a space - be specific about dash
+_BOLD_LABEL_RE = re.compile(r'\*\*([^*]+)\*\*:\s*')
+_BOLD_RE = re.compile(r'\*\*([^*]+)\*\*')
+_SOURCE_MARKER_RE = re.compile(r'\[SOURCE_MARKER:\s*([^]]+)\]')
+# Section headings; only '**LABEL:**' starts a section but any '**LABEL' ends the previous one
+_SECTION_ANCHOR_RE = re.compile(r'\*\*(TL;DR|KEY POINTS|FULL SUMMARY|SOURCES)(:\*\*)?')
+_SECTION_KEYS = {'TL;DR': 'tldr', 'KEY POINTS': 'bullets', 'FULL SUMMARY': 'paragraph', 'SOURCES': 'sources'}
+_ANCHOR_MAX_LEN = len('**FULL SUMMARY:**')
+_SOURCES_SECTION_RE = re.compile(r'\*\*SOURCES?:\*\*\s*(.*?)(?=\*\*|$)', re.DOTALL | re.IGNORECASE)
+_BRACKETED_RE = re.compile(r'\[([^\]]+)\]|\(([^)]+)\)')
+_LIST_ITEM_RE = re.compile(r'(?:^|\n)\s*(?:[•\-\*]|\d+\.)\s*([^\n]+)', re.MULTILINE)
+_SOURCE_SPLIT_RE = re.compile(r'[,;]|\sand\s')
+
+_NUMBA_FORMAT_THRESHOLD = 1_000_000  # Chars - below this the regex pass is faster than the kernel call
+_numba_normalize = None  # Lazy loaded, False when numba is unavailable
+
+
+def _get_numba_normalize():
+    """Get the Numba bullet normalizer (None if numba is not installed)"""
+    global _numba_normalize
+    if _numba_normalize is None:
+        try:
+            from ._format_numba import normalize_bullets_text
+            _numba_normalize = normalize_bullets_text
+        except ImportError as e:
+            logger.info(f"Numba formatter unavailable, using regex formatting: {e}")
+            _numba_normalize = False
+    return _numba_normalize or None
+
+# Model complexity rules - first matching substring of the lowercased name wins
+_COMPLEXITY_RULES = (
+    ('e4b', 100), ('8b', 100),   # High complexity model
+    ('e2b', 75), ('5.6b', 75),   # Medium complexity model
+    ('2b', 50),                  # Low complexity model
+)
+_DEFAULT_COMPLEXITY = 60         # Default medium-low
+
+
+@lru_cache(maxsize=256)
+def _complexity_score(model_name: str) -> int:
+    """Complexity score for a model name (memoized across reloads)"""
+    name = model_name.lower()
+    return next((score for marker, score in _COMPLEXITY_RULES if marker in name), _DEFAULT_COMPLEXITY)
+
+
+# Model preference - custom models with source references first, then the base model
+_LARGE_MODELS = ('accessibility-e4b', 'gemma3n:e4b')  # Complex audio/video and long PDFs
+_SMALL_MODELS = ('accessibility-e2b', 'gemma3n:e2b')  # Text and short content
+
+# Token budgets - the character cap converts at a rough English average
+_CHARS_PER_TOKEN = 4
+# Optional tiktoken approximation of the prompt size; its BPE file is only loaded when
+# already provisioned in TIKTOKEN_CACHE_DIR (see README), never downloaded from here
+_TIKTOKEN_ENCODING = 'cl100k_base'
+_TIKTOKEN_BLOB_URL = 'https://openaipublic.blob.core.windows.net/encodings/cl100k_base.tiktoken'
+
+# Token truncation only encodes a prefix of budget * _CHARS_PER_TOKEN_WINDOW chars; the
+# margin keeps the prefix's last (possibly split) tokens out of the kept range
+_CHARS_PER_TOKEN_WINDOW = 8
+_WINDOW_TOKEN_MARGIN = 16
+
+# Bump when parsing or the summary dict layout changes, so stored summaries are not reused
+_SUMMARY_FORMAT_VERSION = 1
+
+# Fused batch prompts - several short texts summarized in one request
+_ITEM_DELIMITER = '---ITEM---'
+_FUSED_ITEM_TOKENS = 300  # Generation budget per fused item
+
+
+def _tiktoken_cache_path() -> Optional[str]:
+    """Where tiktoken caches the BPE file (same lookup as tiktoken.load, None if caching is off)"""
+    cache_dir = os.environ.get('TIKTOKEN_CACHE_DIR', os.environ.get('DATA_GYM_CACHE_DIR'))
+    if cache_dir is None:
+        cache_dir = os.path.join(tempfile.gettempdir(), 'data-gym-cache')
+    if not cache_dir:
+        return None
+    return os.path.join(cache_dir, hashlib.sha1(_TIKTOKEN_BLOB_URL.encode()).hexdigest())
+
+
+def _install_fast_json():
+    """Decode the ollama client's streamed JSON lines with orjson when it is installed"""
+    try:
+        import orjson
+        from ollama import _client
+    except ImportError:
+        return
+    
+    if getattr(_client, 'json', None) is not json:
+        return  # Client layout changed (or already patched) - keep its own decoder
+    
+    # Same module contents with only loads swapped; orjson.JSONDecodeError subclasses json's
+    fast_json = ModuleType('json')
+    fast_json.__dict__.update(json.__dict__)
+    fast_json.loads = orjson.loads
+    _client.json = fast_json
+    logger.debug("Using orjson for Ollama stream decoding")
+
 
 class ContentType(Enum):
     """Content types for model selection"""
@@ -49,6 +166,57 @@ class OllamaServiceInterface(ABC):
         pass
 
 
+class _SectionStreamParser:
+    """
+    Incremental counterpart of OllamaService._split_sections for streamed text
+    Only the unscanned tail is searched for headings on each feed
+    """
+    
+    def __init__(self):
+        self.buffer = ''
+        self.scan_from = 0
+        self.current: Optional[Tuple[str, int]] = None  # (label, body start) of the open section
+        self.seen = set()
+    
+    def feed(self, text: str, final: bool = False) -> List[Tuple[str, str]]:
+        """Add streamed text and return the sections completed by it"""
+        self.buffer += text
+        buffer = self.buffer
+        completed = []
+        
+        for match in _SECTION_ANCHOR_RE.finditer(buffer, self.scan_from):
+            if not final and not match.group(2) and match.end() + 3 > len(buffer):
+                # Heading at the very end may still grow into '**LABEL:**'
+                self.scan_from = match.start()
+                return completed
+            
+            if self.current:
+                completed.append(self._section(match.start()))
+            label = match.group(1)
+            if match.group(2) and label not in self.seen:
+                self.seen.add(label)
+                self.current = (label, match.end())
+            self.scan_from = match.end()
+        
+        if not final:
+            # A partially received heading is searched again on the next feed
+            self.scan_from = max(self.scan_from, len(buffer) - _ANCHOR_MAX_LEN + 1)
+        elif self.current:
+            completed.append(self._section(None))
+        
+        return completed
+    
+    def _section(self, end: Optional[int]) -> Tuple[str, str]:
+        """Close the open section at end (None = end of the response)"""
+        label, start = self.current
+        self.current = None
+        body = _TERM_TOKEN_RE.sub('', self.buffer[start:end]).strip()
+        if end is None and label == 'TL;DR':
+            # No following section - TL;DR is the first line only
+            body = body.partition('\n')[0].strip()
+        return _SECTION_KEYS[label], body
+
+
 @singleton
 @injectable
 class OllamaService(OllamaServiceInterface):
@@ -58,31 +226,112 @@ class OllamaService(OllamaServiceInterface):
     
     def __init__(self, config_manager: ConfigManager):
         self.config = config_manager
-        self.client = None
-        self._models_cache: Dict[str, ModelInfo] = {}
+        self._client = None  # Created on first use, see client property
+        self._models_loaded = False
+        self._warmup_thread: Optional[threading.Thread] = None
+        self._warmup_events: Dict[str, threading.Event] = {}  # Set once each preloaded model is in memory
+        self._health_cache: Tuple[float, bool] = (float('-inf'), False)  # (checked at, healthy)
+        # Immutable snapshot - readers use it without locking, writers swap it under the lock
+        self._models_cache: Mapping[str, ModelInfo] = MappingProxyType({})
+        self._modelfile_mtimes: Dict[str, float] = {}  # Modelfile mtime per created custom model
+        self._name_index: Dict[str, str] = {}  # Model name or name without ':latest' -> installed name
         self._model_lock = threading.RLock()
-        self._initialize_client()
-        self._setup_models()
+        # Resolved model per candidate list, valid for one (snapshot, AI settings) pair
+        self._selection_memo: Tuple[Any, Any, Dict[Tuple[str, ...], str]] = (None, None, {})
+        self._cache_tag: Tuple[Any, Any, str] = (None, None, '')  # (snapshot, AI settings, tag)
+        
+        # Static chat payload parts - built once and reused for every request
+        self._system_msg = {
+            'role': 'system',
+            'content': "You are an expert at creating ADHD-friendly summaries. Always provide complete, well-structured responses that finish properly."
+        }
+        self._chat_options = {
+            'temperature': 0.3,  # Lower for more consistent structure
+            'top_p': 0.9,
+            'top_k': 40,
+            'num_predict': 800,  # Increased to allow complete summaries
+            'num_ctx': 4096     # Larger context for better understanding
+        }
+        self._sys_ctx: Dict[str, List[int]] = {}  # Prefilled system prompt context per model
+        self._tokenizer = None  # Lazy loaded for token-based truncation
+        self._ai_cfg = None  # Resolved AI settings, see _get_ai_cfg
+        
+        # Client and model list are set up on first use, so importing and
+        # constructing the service stays cheap without a running Ollama
+        self._load_client_settings()
+    
+    def _load_client_settings(self):
+        """Read Ollama connection settings"""
+        ollama_config = self.config.get_ollama_config()
+        self._ollama_config = ollama_config
+        self._host = ollama_config.get('host', 'http://localhost:11434')
+        # Keep models loaded between requests instead of Ollama's 5 minute default
+        self._keep_alive = ollama_config.get('keep_alive', '30m')
+        self._reuse_system_context = ollama_config.get('reuse_system_context', False)
+        self._health_ttl = ollama_config.get('health_ttl_seconds', 5)
+        self._warmup_wait = ollama_config.get('warmup_wait_seconds', 60)
+    
+    @property
+    def client(self):
+        """Ollama client, created on first access"""
+        if self._client is None:
+            with self._model_lock:
+                if self._client is None:
+                    self._initialize_client()
+        return self._client
         
     def _initialize_client(self):
         """Initialize Ollama client"""
         try:
-            ollama_config = self.config.get_ollama_config()
-            host = ollama_config.get('host', 'http://localhost:11434')
+            import ollama  # Deferred - pulls in httpx and pydantic
+            _install_fast_json()
             
-            self.client = ollama.Client(host=host)
-            logger.info(f"Ollama client initialized with host: {host}")
+            # One client for chat/list/create so every call reuses the same pooled sockets
+            self._client = ollama.Client(host=self._host, **self._transport_options(self._ollama_config))
+            logger.info(f"Ollama client initialized with host: {self._host}")
+            logger.info(
+                "Concurrent summaries overlap up to the server's OLLAMA_NUM_PARALLEL slots; "
+                "set OLLAMA_MAX_LOADED_MODELS>=2 to keep e2b and e4b loaded together"
+            )
             
         except Exception as e:
             logger.error(f"Failed to initialize Ollama client: {e}")
             raise
     
+    def _ensure_models(self):
+        """Load the model list on first use"""
+        if not self._models_loaded:
+            with self._model_lock:
+                if not self._models_loaded:
+                    self._models_loaded = True
+                    self._setup_models()
+    
+    def _transport_options(self, ollama_config: Dict[str, Any]) -> Dict[str, Any]:
+        """Build httpx options for a persistent keep-alive connection pool"""
+        import httpx
+        
+        options = {
+            'timeout': httpx.Timeout(ollama_config.get('timeout_seconds', 300)),
+            'limits': httpx.Limits(
+                # Bounded pool - enough sockets for concurrent callers without flooding the server
+                max_connections=ollama_config.get('max_connections', 32),
+                max_keepalive_connections=ollama_config.get('max_keepalive_connections', 4),
+                keepalive_expiry=ollama_config.get('keepalive_expiry_seconds', 60)
+            )
+        }
+        
+        # HTTP/2 needs the optional 'h2' package (negotiated when Ollama sits behind TLS)
+        if importlib.util.find_spec('h2') is not None:
+            options['http2'] = True
+        
+        return options
+    
     def _setup_models(self):
         """Setup and cache available models"""
         try:
             # Get available models
             models_response = self.client.list()
-            logger.debug(f"Raw models response: {models_response}")
+            logger.debug("Raw models response: %s", models_response)
             
             # Handle both dict format and object format
             if hasattr(models_response, 'models'):
@@ -92,20 +341,14 @@ class OllamaService(OllamaServiceInterface):
             
             logger.info(f"Found {len(models_list)} models in response")
             
+            # Handle both dict and object formats (detected once per response)
+            fields = self._model_fields_getter(models_list)
+            
+            models: Dict[str, ModelInfo] = {}
             for model_data in models_list:
-                logger.debug(f"Processing model data: {model_data}")
+                logger.debug("Processing model data: %s", model_data)
                 
-                # Handle both dict and object formats
-                if hasattr(model_data, 'model'):
-                    name = model_data.model
-                    size = getattr(model_data, 'size', 0)
-                    digest = getattr(model_data, 'digest', '')
-                    modified_at = getattr(model_data, 'modified_at', '')
-                else:
-                    name = model_data.get('name') or model_data.get('model')
-                    size = model_data.get('size', 0)
-                    digest = model_data.get('digest', model_data.get('id', ''))
-                    modified_at = model_data.get('modified_at', model_data.get('modified', ''))
+                name, size, digest, modified_at = fields(model_data)
                 
                 if not name:
                     logger.warning(f"Model data missing name: {model_data}")
@@ -120,104 +363,243 @@ class OllamaService(OllamaServiceInterface):
                     complexity_score=self._calculate_complexity_score(name)
                 )
                 
-                self._models_cache[name] = model_info
+                models[name] = model_info
                 logger.info(f"Cached model: {name} (complexity: {model_info.complexity_score})")
             
-            # Setup custom models if not exist (temporarily disabled)
-            # self._ensure_custom_models()
+            self._publish_models(models)
+            
+            # Setup custom models if not exist - off the request path, base models serve until then
+            if self._ollama_config.get('create_custom_models', False):
+                threading.Thread(
+                    target=self._ensure_custom_models, name='ollama-custom-models', daemon=True
+                ).start()
+            
+            # Load model weights in the background so the first request skips the cold load
+            if self._models_cache and self._ollama_config.get('warmup_on_startup', True):
+                warmup_models = self._warmup_models()
+                # Events exist before the thread starts, so early requests know what to wait for
+                self._warmup_events = {model_name: threading.Event() for model_name in warmup_models}
+                self._warmup_thread = threading.Thread(
+                    target=self._warmup, args=(warmup_models,), name='ollama-warmup', daemon=True
+                )
+                self._warmup_thread.start()
             
         except Exception as e:
             logger.error(f"Error setting up models: {e}")
             # Log more details for debugging
-            logger.debug(f"Full error details: {e}", exc_info=True)
+            logger.debug("Full error details: %s", e, exc_info=True)
+    
+    @staticmethod
+    def _model_fields_getter(models_list: List[Any]):
+        """Get a (name, size, digest, modified_at) extractor for the list's entry format"""
+        if models_list and hasattr(models_list[0], 'model'):
+            return attrgetter('model', 'size', 'digest', 'modified_at')
+        
+        return lambda model_data: (
+            model_data.get('name') or model_data.get('model'),
+            model_data.get('size', 0),
+            model_data.get('digest', model_data.get('id', '')),
+            model_data.get('modified_at', model_data.get('modified', ''))
+        )
+    
+    def _warmup_models(self) -> List[str]:
+        """Models to preload at startup, the common text model first"""
+        content_types = [ContentType.TEXT]
+        # The large model only stays resident next to the text model when two fit
+        if self._get_ai_cfg().batching.get('max_loaded_models', 1) >= 2:
+            content_types.append(ContentType.VIDEO)
+        
+        warmup_models = []
+        for content_type in content_types:
+            try:
+                model_name = self._select_model(content_type)
+            except RuntimeError:
+                break
+            if model_name not in warmup_models:
+                warmup_models.append(model_name)
+        return warmup_models
+    
+    def _warmup(self, warmup_models: List[str]):
+        """Load the given models into Ollama memory, in order"""
+        for model_name in warmup_models:
+            try:
+                start_time = time.time()
+                # An empty prompt only loads the weights, nothing is generated
+                self.client.generate(model=model_name, prompt='', keep_alive=self._keep_alive)
+                logger.info(f"Warmed up {model_name} in {time.time() - start_time:.2f}s")
+            except Exception as e:
+                logger.warning(f"Warmup failed for {model_name}: {e}")
+            finally:
+                self._warmup_events[model_name].set()
+    
+    def wait_for_warmup(self, timeout: Optional[float] = None, model_name: Optional[str] = None) -> bool:
+        """
+        Wait for the startup model preload to finish
+        
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
+            model_name: Only wait until this model is loaded (no wait if it isn't preloaded)
+            
+        Returns:
+            True if the awaited preload is no longer running
+        """
+        if model_name is not None:
+            event = self._warmup_events.get(model_name)
+            return event is None or event.wait(timeout)
+        
+        thread = self._warmup_thread
+        if thread is not None:
+            thread.join(timeout)
+            return not thread.is_alive()
+        return True
+    
+    def _publish_models(self, models: Dict[str, ModelInfo]):
+        """Atomically replace the models snapshot"""
+        with self._model_lock:
+            self._models_cache = MappingProxyType(models)
+            self._name_index = self._build_name_index(models)
+    
+    @staticmethod
+    def _build_name_index(models: Dict[str, ModelInfo]) -> Dict[str, str]:
+        """Map installed names and their ':latest'-less aliases to the installed name"""
+        index = {name: name for name in models}
+        for name in models:
+            # Exact names win over aliases ('x' is preferred to 'x:latest')
+            index.setdefault(name.removesuffix(':latest'), name)
+        return index
     
     def _calculate_complexity_score(self, model_name: str) -> int:
-        """Calculate complexity score based on model name/size"""
-        if 'e4b' in model_name or '8b' in model_name.lower():
-            return 100  # High complexity model
-        elif 'e2b' in model_name or '5.6b' in model_name.lower():
-            return 75   # Medium complexity model
-        elif '2b' in model_name.lower():
-            return 50   # Low complexity model
-        else:
-            return 60   # Default medium-low
+        """Calculate complexity score based on model name/size (quantized tags score like their base)"""
+        return _complexity_score(model_name)
     
     def _ensure_custom_models(self):
         """Ensure our custom accessibility models exist"""
         custom_models = {
-            'accessibility-e4b': 'src/models/Modelfile.e4b',
-            'accessibility-e2b': 'src/models/Modelfile.e2b'
+            'accessibility-e4b': Path('src/models/Modelfile.e4b'),
+            'accessibility-e2b': Path('src/models/Modelfile.e2b')
         }
         
+        created: Dict[str, ModelInfo] = {}
         for model_name, modelfile_path in custom_models.items():
-            if model_name not in self._models_cache:
-                try:
-                    # Read the modelfile
-                    with open(modelfile_path, 'r') as f:
-                        modelfile_content = f.read()
-                    
-                    # Create custom model using correct API
-                    self.client.create(model=model_name, modelfile=modelfile_content)
-                    logger.info(f"Created custom model: {model_name}")
-                    
-                    # Add to cache
-                    base_model = 'gemma3n:e4b' if 'e4b' in model_name else 'gemma3n:e2b'
-                    complexity = 100 if 'e4b' in model_name else 75
-                    
-                    self._models_cache[model_name] = ModelInfo(
-                        name=model_name,
-                        size="custom",
-                        id="custom",
-                        modified=str(time.time()),
-                        complexity_score=complexity
-                    )
-                    
-                except FileNotFoundError:
-                    logger.warning(f"Modelfile not found: {modelfile_path}")
-                except Exception as e:
-                    logger.warning(f"Could not create custom model {model_name}: {e}")
-                    # Continue with base models if custom creation fails
+            try:
+                # Skip models that exist and whose Modelfile hasn't changed since we created them
+                mtime = modelfile_path.stat().st_mtime
+                if model_name in self._name_index and self._modelfile_mtimes.get(model_name, mtime) == mtime:
+                    continue
+                
+                # Create custom model using correct API
+                self.client.create(model=model_name, modelfile=modelfile_path.read_text())
+                self._modelfile_mtimes[model_name] = mtime
+                logger.info(f"Created custom model: {model_name}")
+                
+                # Add to cache
+                complexity = 100 if 'e4b' in model_name else 75
+                
+                created[model_name] = ModelInfo(
+                    name=model_name,
+                    size="custom",
+                    id="custom",
+                    modified=str(time.time()),
+                    complexity_score=complexity
+                )
+                
+            except FileNotFoundError:
+                logger.warning(f"Modelfile not found: {modelfile_path}")
+            except Exception as e:
+                logger.warning(f"Could not create custom model {model_name}: {e}")
+                # Continue with base models if custom creation fails
+        
+        if created:
+            # Merge into the latest snapshot - it may have been replaced while models were created
+            with self._model_lock:
+                self._publish_models({**self._models_cache, **created})
     
-    def _select_model(self, content_type: ContentType, content_length: int = 0) -> str:
+    def _select_model(self, content_type: ContentType, content_length: int = 0,
+                      ai_cfg: Optional[SimpleNamespace] = None) -> str:
         """
         Intelligently select model based on content type and complexity
         
         Args:
             content_type: Type of content being processed
             content_length: Length of content (chars)
+            ai_cfg: Resolved AI settings, if the caller already has them
             
         Returns:
             Best model name for the task
         """
-        with self._model_lock:
-            # Define model selection rules - prioritize custom models with source references
-            if content_type in [ContentType.VIDEO, ContentType.AUDIO]:
-                # Use larger model for complex audio/video content
-                preferred_models = ['accessibility-e4b', 'gemma3n:e4b']
-            elif content_type == ContentType.PDF and content_length > 10000:
-                # Use larger model for long PDFs
-                preferred_models = ['accessibility-e4b', 'gemma3n:e4b']
-            else:
-                # Use smaller, faster model for text and short content
-                preferred_models = ['accessibility-e2b', 'gemma3n:e2b']
-            
-            # Find first available model from preferred list
-            for model_name in preferred_models:
-                # Check both with and without :latest suffix
-                available_names = [model_name, f"{model_name}:latest"]
-                for name in available_names:
-                    if name in self._models_cache:
-                        logger.debug(f"Selected model {name} for {content_type.value}")
-                        return name
-            
-            # Fallback to any available model
-            available_models = list(self._models_cache.keys())
-            if available_models:
-                fallback = available_models[0]
-                logger.warning(f"Using fallback model {fallback} for {content_type.value}")
-                return fallback
-            
-            raise RuntimeError("No models available")
+        self._ensure_models()
+        ai_cfg = ai_cfg or self._get_ai_cfg()
+        
+        # Quantized variants are only preferred for short prompts
+        quantized = content_length < ai_cfg.quant_max_content_length
+        if content_type is ContentType.PDF and content_length > 10000:
+            # Use larger model for long PDFs
+            candidates = ai_cfg.pdf_long_models[quantized]
+        else:
+            candidates = ai_cfg.preferred_models[quantized][content_type]
+        
+        # Lock-free read of the current snapshot
+        available = self._name_index
+        snapshot, cfg, memo = self._selection_memo
+        if snapshot is not available or cfg is not ai_cfg:
+            memo = {}
+            self._selection_memo = (available, ai_cfg, memo)
+        
+        model_name = memo.get(candidates)
+        if model_name is None:
+            model_name = memo[candidates] = self._resolve_model(candidates, available, content_type)
+        return model_name
+    
+    def _resolve_model(self, candidates: Tuple[str, ...], available: Dict[str, str],
+                       content_type: ContentType) -> str:
+        """Pick the first available candidate, falling back to any available model"""
+        # Find first available model from preferred list
+        for candidate in candidates:
+            name = available.get(candidate)
+            if name:
+                logger.debug("Selected model %s for %s", name, content_type.value)
+                return name
+        
+        # Fallback to any available model
+        models = self._models_cache
+        if models:
+            fallback = next(iter(models))
+            logger.warning(f"Using fallback model {fallback} for {content_type.value}")
+            return fallback
+        
+        raise RuntimeError("No models available")
+    
+    def summary_cache_tag(self) -> str:
+        """
+        Fingerprint of everything besides the content that shapes a summary
+        
+        Covers the installed models (name and digest), the quantized variant,
+        prompts, content limits, generation options and the parser version,
+        so stored summaries are not reused once any of them changes.
+        
+        Returns:
+            Short hex digest
+        """
+        self._ensure_models()
+        ai_cfg = self._get_ai_cfg()
+        models = self._models_cache
+        snapshot, cfg, tag = self._cache_tag
+        if snapshot is models and cfg is ai_cfg:
+            return tag
+        
+        payload = json.dumps({
+            'format': _SUMMARY_FORMAT_VERSION,
+            'models': sorted((info.name, info.id) for info in models.values()),
+            'quant_variant': ai_cfg.source.get('quant_variant'),
+            'quant_max_content_length': ai_cfg.quant_max_content_length,
+            'prompts': [ai_cfg.structured_headers[content_type] for content_type in ContentType],
+            'max_content_length': ai_cfg.max_content_length,
+            'max_content_tokens': ai_cfg.max_content_tokens,
+            'options': self._chat_options
+        }, sort_keys=True)
+        tag = hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]
+        self._cache_tag = (models, ai_cfg, tag)
+        return tag
     
     def generate_summary(self, content: str, content_type: ContentType, **kwargs) -> Dict[str, str]:
         """
@@ -226,105 +608,560 @@ class OllamaService(OllamaServiceInterface):
         Args:
             content: Content to summarize
             content_type: Type of content
-            **kwargs: Additional parameters
+            **kwargs: Additional parameters (model_name overrides model selection,
+                options overrides individual generation options)
             
         Returns:
-            Dictionary with structured summary sections
+            Dictionary with structured summary sections ('fallback' is True
+            when the model could not be reached and placeholder text is returned)
         """
         try:
-            # Select appropriate model
-            model_name = self._select_model(content_type, len(content))
+            model_name, messages = self._prepare_chat(content, content_type, kwargs.get('model_name'))
+            # A concurrent preload of the same model would make Ollama load it twice
+            if not self.wait_for_warmup(self._warmup_wait, model_name):
+                logger.info(f"Preload of {model_name} still running - sending request anyway")
+            response = self._request_summary(model_name, messages, self._request_options(kwargs.get('options')))
             
-            # Get AI configuration
-            ai_config = self.config.get_ai_config()
+            return self._handle_chat_response(response, model_name)
             
-            # Build structured prompt
-            prompt = self._build_structured_prompt(content, content_type)
+        except Exception as e:
+            logger.error(f"Error generating summary: {e}")
+            return self._create_fallback_summary(content)
+    
+    def _request_summary(self, model_name: str, messages: List[Dict[str, str]],
+                         options: Dict[str, Any]) -> Dict[str, Any]:
+        """Send a summary request and return the chat-shaped response"""
+        if self._reuse_system_context:
+            return self._generate_with_system_context(model_name, messages[-1]['content'], options)
+        
+        # Generate response with better settings for complete summaries
+        return self.client.chat(
+            model=model_name,
+            messages=messages,
+            options=options,
+            keep_alive=self._keep_alive
+        )
+    
+    def generate_summary_stream(self, content: str, content_type: ContentType, **kwargs) -> Iterator[str]:
+        """
+        Stream a summary as it is generated, one formatted line at a time
+        
+        Args:
+            content: Content to summarize
+            content_type: Type of content
+            **kwargs: Additional parameters (model_name overrides model selection,
+                options overrides individual generation options)
+            
+        Yields:
+            Completed summary lines, KEY POINTS bullets normalized by _format_summary
+        """
+        section = None
+        
+        def format_line(line: str) -> str:
+            # Headings pass through untouched - only key point lines are bullets
+            nonlocal section
+            line = line.strip()
+            heading = _SECTION_ANCHOR_RE.match(line)
+            if heading:
+                section = heading.group(1)
+                return line
+            return self._format_summary(line) if section == 'KEY POINTS' else line
+        
+        # Only the current partial line is buffered
+        buffer = ''
+        for piece in self._stream_chat(content, content_type, **kwargs):
+            buffer += piece
+            if '\n' not in buffer:
+                continue
+            *lines, buffer = buffer.split('\n')
+            for line in lines:
+                line = format_line(line)
+                if line:
+                    yield line + '\n'
+        
+        tail = format_line(buffer)
+        if tail:
+            yield tail
+    
+    def generate_summary_sections(self, content: str, content_type: ContentType,
+                                  **kwargs) -> Iterator[Tuple[str, str]]:
+        """
+        Stream a summary section by section as it is generated
+        
+        Each section is yielded as soon as the next heading arrives, so the
+        TL;DR can be shown while the key points are still being written.
+        
+        Args:
+            content: Content to summarize
+            content_type: Type of content
+            **kwargs: Same as generate_summary_stream
             
-            # Generate response with better settings for complete summaries
-            response = self.client.chat(
+        Yields:
+            (section, text) pairs - section is 'tldr', 'bullets', 'paragraph' or 'sources'
+        """
+        parser = _SectionStreamParser()
+        for piece in self._stream_chat(content, content_type, **kwargs):
+            yield from parser.feed(piece)
+        yield from parser.feed('', final=True)
+    
+    def _stream_chat(self, content: str, content_type: ContentType, **kwargs) -> Iterator[str]:
+        """Stream raw response text pieces for a summary request"""
+        model_name, messages = self._prepare_chat(content, content_type, kwargs.get('model_name'))
+        if not self.wait_for_warmup(self._warmup_wait, model_name):
+            logger.info(f"Preload of {model_name} still running - sending request anyway")
+        
+        try:
+            stream = self.client.chat(
                 model=model_name,
-                messages=[
-                    {
-                        'role': 'system',
-                        'content': "You are an expert at creating ADHD-friendly summaries. Always provide complete, well-structured responses that finish properly."
-                    },
-                    {
-                        'role': 'user', 
-                        'content': prompt
-                    }
-                ],
-                options={
-                    'temperature': 0.3,  # Lower for more consistent structure
-                    'top_p': 0.9,
-                    'top_k': 40,
-                    'num_predict': 800,  # Increased to allow complete summaries
-                    'num_ctx': 4096     # Larger context for better understanding
-                }
+                messages=messages,
+                options=self._request_options(kwargs.get('options')),
+                keep_alive=self._keep_alive,
+                stream=True
             )
+            for chunk in stream:
+                yield chunk['message']['content']
+                
+        except Exception as e:
+            logger.error(f"Error streaming summary from {model_name}: {e}")
+            raise
+    
+    async def _agenerate(self, aclient, content: str, content_type: ContentType,
+                         model_name: Optional[str] = None) -> Dict[str, Any]:
+        """Async counterpart of generate_summary using the given AsyncClient"""
+        try:
+            model_name, messages = self._prepare_chat(content, content_type, model_name)
+            # Same preload wait as generate_summary, off the event loop
+            if not await asyncio.to_thread(self.wait_for_warmup, self._warmup_wait, model_name):
+                logger.info(f"Preload of {model_name} still running - sending request anyway")
+            response = await self._arequest_summary(aclient, model_name, messages, self._chat_options)
             
-            raw_summary = response['message']['content']
-            logger.info(f"Generated summary using {model_name} ({len(raw_summary)} chars)")
-            print(f"DEBUG: Full raw response: {repr(raw_summary)}")
-            
-            # Parse structured response
-            result = self._parse_structured_summary(raw_summary)
-            print(f"DEBUG: Parse result: {result}")
-            
-            return result
+            return self._handle_chat_response(response, model_name)
             
         except Exception as e:
             logger.error(f"Error generating summary: {e}")
             return self._create_fallback_summary(content)
     
-    def _build_prompt(self, content: str, content_type: ContentType) -> str:
-        """Build appropriate prompt for content type"""
+    async def _arequest_summary(self, aclient, model_name: str, messages: List[Dict[str, str]],
+                                options: Dict[str, Any]) -> Dict[str, Any]:
+        """Async counterpart of _request_summary using the given AsyncClient"""
+        if self._reuse_system_context:
+            # The system prompt is prefilled once per model on the shared sync client
+            context = await asyncio.to_thread(self._system_context, model_name)
+            response = await aclient.generate(
+                model=model_name,
+                prompt=messages[-1]['content'],
+                context=context,
+                options=options,
+                keep_alive=self._keep_alive
+            )
+            return {'message': {'content': response['response']}}
+        
+        return await aclient.chat(
+            model=model_name,
+            messages=messages,
+            options=options,
+            keep_alive=self._keep_alive
+        )
+    
+    async def generate_summaries(self, items: List[Tuple[str, ContentType]],
+                                 model_name: Optional[str] = None) -> List[Any]:
+        """
+        Generate summaries for several documents concurrently
+        
+        Requests overlap up to the server's parallel slots, so set
+        OLLAMA_NUM_PARALLEL (requests per model) and OLLAMA_MAX_LOADED_MODELS
+        (e2b and e4b resident together) on the Ollama server to benefit.
+        
+        Args:
+            items: (content, content_type) pairs
+            model_name: Model for every item (selected per item if omitted)
+            
+        Returns:
+            Summary dictionaries in input order (exceptions returned in place)
+        """
+        # Pooled connections belong to the running loop, so the client lives for this call only
+        aclient = self._open_async_client()
+        try:
+            return await asyncio.gather(
+                *(self._agenerate(aclient, content, content_type, model_name) for content, content_type in items),
+                return_exceptions=True
+            )
+        finally:
+            await self._aclose_client(aclient)
+    
+    def generate_summaries_sync(self, items: List[Tuple[str, ContentType]]) -> List[Any]:
+        """Blocking wrapper around generate_summaries for non-async callers"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.generate_summaries(items))
+        
+        # asyncio.run can't nest inside a running loop (e.g. a UI handler) - use a worker thread
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix='ollama-sync') as executor:
+            return executor.submit(asyncio.run, self.generate_summaries(items)).result()
+    
+    def generate_summaries_batched(self, items: List[Tuple[str, ContentType]]) -> List[Dict[str, Any]]:
+        """
+        Generate summaries grouped by model on the pooled client
+        
+        Same-model requests run back to back, so the model stays loaded and
+        every request reuses the keep-alive connection.
+        
+        Args:
+            items: (content, content_type) pairs
+            
+        Returns:
+            Summary dictionaries in input order
+        """
+        buckets: Dict[str, List[int]] = {}
+        for index, (content, content_type) in enumerate(items):
+            model_name = self._select_model(content_type, len(content))
+            buckets.setdefault(model_name, []).append(index)
+        
+        results: List[Dict[str, Any]] = [None] * len(items)
+        for model_name, indices in buckets.items():
+            logger.debug("Batch of %d requests for %s", len(indices), model_name)
+            for index in indices:
+                content, content_type = items[index]
+                try:
+                    _, messages = self._prepare_chat(content, content_type, model_name)
+                    response = self._request_summary(model_name, messages, self._chat_options)
+                    results[index] = self._handle_chat_response(response, model_name)
+                except Exception as e:
+                    logger.error(f"Error generating summary: {e}")
+                    results[index] = self._create_fallback_summary(content)
+        
+        return results
+    
+    def generate_summary_batch(self, items: List[Tuple[str, ContentType]]) -> List[Any]:
+        """
+        Summarize several documents, fusing short texts into a single request
+        
+        When every item is short TEXT content, one chat call summarizes all of
+        them and the response is split on a delimiter. Anything else, or a
+        response that does not split cleanly, goes through generate_summaries.
+        
+        Args:
+            items: (content, content_type) pairs
+            
+        Returns:
+            Summary dictionaries in input order
+        """
+        batching = self._get_ai_cfg().batching
+        max_chars = batching.get('fused_max_chars', 500)
+        fusable = (
+            1 < len(items) <= batching.get('fused_max_items', 8)
+            and all(content_type is ContentType.TEXT and len(content) <= max_chars
+                    for content, content_type in items)
+        )
+        
+        if fusable:
+            try:
+                results = self._generate_fused([content for content, _ in items])
+                if results is not None:
+                    return results
+            except Exception as e:
+                logger.warning(f"Fused summary request failed, summarizing items separately: {e}")
+        
+        return self.generate_summaries_sync(items)
+    
+    def _generate_fused(self, contents: List[str]) -> Optional[List[Dict[str, Any]]]:
+        """Summarize short texts in one chat call (None if the response doesn't split per item)"""
+        model_name = self._select_model(ContentType.TEXT, sum(map(len, contents)))
+        header = self._get_ai_cfg().structured_headers[ContentType.TEXT]
+        
+        items_text = '\n\n'.join(f"ITEM {index}:\n{content}" for index, content in enumerate(contents, 1))
+        prompt = (
+            f"{header}{len(contents)} separate items follow. Summarize each item independently "
+            f"using the format above, in order, and put a line containing only {_ITEM_DELIMITER} "
+            f"between the summaries.\n\n{items_text}"
+        )
+        num_predict = min(_FUSED_ITEM_TOKENS * len(contents), self._chat_options['num_ctx'] // 2)
+        
+        response = self.client.chat(
+            model=model_name,
+            messages=[self._system_msg, {'role': 'user', 'content': prompt}],
+            options=self._request_options({'num_predict': num_predict}),
+            keep_alive=self._keep_alive
+        )
+        
+        parts = [part for part in response['message']['content'].split(_ITEM_DELIMITER) if part.strip()]
+        if len(parts) != len(contents):
+            logger.warning(f"Fused response had {len(parts)} summaries for {len(contents)} items")
+            return None
+        
+        logger.info(f"Fused {len(contents)} summaries into 1 request using {model_name} "
+                    f"({len(contents)} -> 1 HTTP calls)")
+        return [self._parse_structured_summary(part) for part in parts]
+    
+    def _request_options(self, overrides: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Generation options for a request (shared dict unless overrides are given)"""
+        if overrides:
+            return {**self._chat_options, **overrides}
+        return self._chat_options
+    
+    def _system_context(self, model_name: str) -> List[int]:
+        """Get the prefilled system prompt context for a model (computed once per model)"""
+        context = self._sys_ctx.get(model_name)
+        if context is None:
+            with self._model_lock:
+                context = self._sys_ctx.get(model_name)
+                if context is None:
+                    # num_predict 0 means unlimited in Ollama, so generate a single token
+                    response = self.client.generate(
+                        model=model_name,
+                        prompt=self._system_msg['content'],
+                        options={'num_predict': 1},
+                        keep_alive=self._keep_alive
+                    )
+                    context = response['context']
+                    self._sys_ctx[model_name] = context
+        return context
+    
+    def _generate_with_system_context(self, model_name: str, prompt: str,
+                                      options: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run a summary request on top of the cached system prompt context
+        
+        Args:
+            model_name: Model to use
+            prompt: User prompt
+            options: Generation options
+            
+        Returns:
+            Chat-shaped response ({'message': {'content': ...}})
+        """
+        response = self.client.generate(
+            model=model_name,
+            prompt=prompt,
+            context=self._system_context(model_name),
+            options=options,
+            keep_alive=self._keep_alive
+        )
+        return {'message': {'content': response['response']}}
+    
+    def _open_async_client(self):
+        """Create an AsyncClient for the running event loop (close it with _aclose_client)"""
+        import ollama
+        return ollama.AsyncClient(host=self._host, **self._transport_options(self._ollama_config))
+    
+    @staticmethod
+    async def _aclose_client(aclient):
+        """Close the httpx connection pool behind an AsyncClient"""
+        http_client = getattr(aclient, '_client', None)
+        if http_client is not None:
+            await http_client.aclose()
+    
+    def _prepare_chat(self, content: str, content_type: ContentType,
+                      model_name: Optional[str] = None) -> Tuple[str, List[Dict[str, str]]]:
+        """Select model (unless given) and build chat messages for a summary request"""
+        # Resolve settings once for model selection and prompt building
+        ai_cfg = self._get_ai_cfg()
+        
+        # Select appropriate model
+        if model_name is None:
+            model_name = self._select_model(content_type, len(content), ai_cfg)
+        
+        # Build structured prompt
+        prompt = self._build_structured_prompt(content, content_type, ai_cfg)
+        
+        return model_name, [self._system_msg, {'role': 'user', 'content': prompt}]
+    
+    def _handle_chat_response(self, response, model_name: str) -> Dict[str, Any]:
+        """Parse a chat response into structured summary sections"""
+        raw_summary = response['message']['content']
+        logger.info(f"Generated summary using {model_name} ({len(raw_summary)} chars)")
+        logger.debug("Full raw response: %r", raw_summary)
+        
+        # Parse structured response
+        result = self._parse_structured_summary(raw_summary)
+        logger.debug("Parse result: %s", result)
+        
+        return result
+    
+    def _get_ai_cfg(self) -> SimpleNamespace:
+        """Get resolved AI settings and prompt templates (rebuilt only after a config reload)"""
         ai_config = self.config.get_ai_config()
+        cached = self._ai_cfg
+        if cached is not None and cached.source is ai_config:
+            return cached
+        
         prompts = ai_config.get('prompts', {})
+        video_template = prompts.get('video_prompt_template', 'Summarize this video transcript: {content}')
         
-        # Get template based on content type
-        if content_type == ContentType.PDF:
-            template = prompts.get('pdf_prompt_template', 'Summarize this PDF: {content}')
-        elif content_type in [ContentType.VIDEO, ContentType.AUDIO]:
-            template = prompts.get('video_prompt_template', 'Summarize this video transcript: {content}')
-        else:
-            template = prompts.get('text_prompt_template', 'Summarize this text: {content}')
+        model_prompts = ai_config.get('model_prompts', {})
+        base_prompt = model_prompts.get('structured_summary_prompt', '')
+        video_prompt = model_prompts.get('video_processing_prompt', '')
+        content_prompts = {
+            ContentType.TEXT: model_prompts.get('text_processing_prompt', ''),
+            ContentType.PDF: model_prompts.get('pdf_processing_prompt', ''),
+            ContentType.VIDEO: video_prompt,
+            ContentType.AUDIO: video_prompt
+        }
+        
+        templates = {
+            ContentType.TEXT: prompts.get('text_prompt_template', 'Summarize this text: {content}'),
+            ContentType.PDF: prompts.get('pdf_prompt_template', 'Summarize this PDF: {content}'),
+            ContentType.VIDEO: video_template,
+            ContentType.AUDIO: video_template
+        }
+        
+        performance = ai_config.get('performance', {})
+        max_content_length = performance.get('max_content_length', 3000)
+        
+        # Preferred model candidates in priority order (':latest' tags resolve through the name index)
+        quant_variant = ai_config.get('quant_variant')
+        
+        def candidates(models: Tuple[str, ...], quantized: bool) -> Tuple[str, ...]:
+            if quantized and quant_variant:
+                # Opt-in variant tag first (e.g. a different quantization), plain tag stays as fallback
+                models = models[:-1] + (f"{models[-1]}-{quant_variant}", models[-1])
+            return models
+        
+        preferred_models = {
+            quantized: {
+                ContentType.TEXT: candidates(_SMALL_MODELS, quantized),
+                ContentType.PDF: candidates(_SMALL_MODELS, quantized),
+                ContentType.VIDEO: candidates(_LARGE_MODELS, quantized),
+                ContentType.AUDIO: candidates(_LARGE_MODELS, quantized)
+            }
+            for quantized in (False, True)
+        }
+        
+        self._ai_cfg = SimpleNamespace(
+            source=ai_config,
+            templates=templates,
+            template_parts={
+                content_type: self._split_template(template)
+                for content_type, template in templates.items()
+            },
+            structured_headers={
+                content_type: f"{content_prompt}\n\n{base_prompt}\n\nContent to analyze:\n"
+                for content_type, content_prompt in content_prompts.items()
+            },
+            performance=performance,
+            max_content_length=max_content_length,
+            # Token cap defaults to the character cap's equivalent, so prompts don't grow with a tokenizer
+            max_content_tokens=performance.get('max_content_tokens') or max_content_length // _CHARS_PER_TOKEN,
+            token_budgets={},  # Content token budget per prompt header, filled on first use
+            batching=ai_config.get('batching', {}),
+            preferred_models=preferred_models,
+            pdf_long_models={quantized: candidates(_LARGE_MODELS, quantized) for quantized in (False, True)},
+            quant_max_content_length=ai_config.get('quant_max_content_length', 8000)
+        )
+        return self._ai_cfg
+    
+    @staticmethod
+    def _split_template(template: str) -> Optional[Tuple[str, str]]:
+        """Split template into (prefix, suffix) around {content}, None if it needs str.format"""
+        prefix, placeholder, suffix = template.partition('{content}')
+        if not placeholder:
+            logger.warning(f"Prompt template has no {{content}} placeholder, content will be dropped: {template[:60]!r}")
+            return None
+        if any(brace in prefix + suffix for brace in '{}'):
+            return None
+        return prefix, suffix
+    
+    def _build_prompt(self, content: str, content_type: ContentType) -> str:
+        """Build appropriate prompt for content type"""
+        ai_cfg = self._get_ai_cfg()
         
         # Truncate content if too long
         max_content_length = 4000  # Leave room for prompt structure
-        if len(content) > max_content_length:
-            content = content[:max_content_length] + "...\n[Content truncated for processing]"
+        truncated = len(content) > max_content_length
+        
+        parts = ai_cfg.template_parts[content_type]
+        if parts is None:
+            if truncated:
+                content = content[:max_content_length] + "...\n[Content truncated for processing]"
+            return ai_cfg.templates[content_type].format(content=content)
         
-        return template.format(content=content)
+        # Single join - no intermediate truncated copy or format parsing
+        prefix, suffix = parts
+        if truncated:
+            return ''.join((prefix, content[:max_content_length], "...\n[Content truncated for processing]", suffix))
+        return ''.join((prefix, content, suffix))
 
-    def _build_structured_prompt(self, content: str, content_type: ContentType) -> str:
+    def _build_structured_prompt(self, content: str, content_type: ContentType,
+                                 ai_cfg: Optional[SimpleNamespace] = None) -> str:
         """Build structured prompt for consistent UI section output"""
-        ai_config = self.config.get_ai_config()
-        prompts = ai_config.get('model_prompts', {})
+        ai_cfg = ai_cfg or self._get_ai_cfg()
+        header = ai_cfg.structured_headers[content_type]
         
-        # Get the structured prompt template
-        base_prompt = prompts.get('structured_summary_prompt', '')
+        # Optimize content length for faster processing
+        content = self._truncate_content(content, header, ai_cfg)
         
-        # Get content-specific prompt
-        if content_type == ContentType.PDF:
-            content_prompt = prompts.get('pdf_processing_prompt', '')
-        elif content_type in [ContentType.VIDEO, ContentType.AUDIO]:
-            content_prompt = prompts.get('video_processing_prompt', '')
-        else:
-            content_prompt = prompts.get('text_processing_prompt', '')
+        return header + content
+    
+    @property
+    def tokenizer(self):
+        """Lazy load tokenizer used for context budgeting (None if unavailable)"""
+        if self._tokenizer is None:
+            self._tokenizer = False
+            try:
+                import tiktoken
+                cache_path = _tiktoken_cache_path()
+                # get_encoding would download the BPE file - never go online from here
+                if cache_path is None or not os.path.exists(cache_path):
+                    logger.info("tiktoken encoding not provisioned (see TIKTOKEN_CACHE_DIR), truncating by characters")
+                else:
+                    self._tokenizer = tiktoken.get_encoding(_TIKTOKEN_ENCODING)
+            except Exception as e:
+                logger.info(f"Tokenizer unavailable, truncating by characters: {e}")
+        return self._tokenizer or None
+    
+    def _truncate_content(self, content: str, header: str, ai_cfg: SimpleNamespace) -> str:
+        """
+        Truncate content so the full prompt fits the model context window
         
-        # Optimize content length for faster processing
-        performance_config = ai_config.get('performance', {})
-        max_length = performance_config.get('max_content_length', 3000)
+        Args:
+            content: Content to analyze
+            header: Prompt text placed before the content
+            ai_cfg: Resolved AI settings (see _get_ai_cfg)
+            
+        Returns:
+            Content, truncated with a marker if it would overflow
+        """
+        truncation_marker = "...\n[Content truncated for faster processing]"
+        tokenizer = self.tokenizer
         
-        if len(content) > max_length:
-            content = content[:max_length] + "...\n[Content truncated for faster processing]"
+        if tokenizer is None:
+            max_length = ai_cfg.max_content_length
+            if len(content) > max_length:
+                content = content[:max_length] + truncation_marker
+            return content
+        
+        budget = ai_cfg.token_budgets.get(header)
+        if budget is None:
+            # Token budget = context window minus generation, system and prompt header
+            reserved = (
+                self._chat_options['num_predict']
+                + len(tokenizer.encode(self._system_msg['content'] + header, disallowed_special=()))
+                + 64  # Chat template overhead and truncation marker
+            )
+            budget = self._chat_options['num_ctx'] - reserved
+            max_tokens = ai_cfg.max_content_tokens
+            if max_tokens:
+                budget = min(budget, max_tokens)
+            budget = ai_cfg.token_budgets[header] = max(budget, 0)
         
-        return f"{content_prompt}\n\n{base_prompt}\n\nContent to analyze:\n{content}"
+        # Every token covers at least one UTF-8 byte, so short content skips tokenization
+        if len(content) <= budget // 4 or len(content.encode('utf-8')) <= budget:
+            return content
+        
+        # Tokenize a bounded prefix so long transcripts are not encoded in full
+        window = content[:budget * _CHARS_PER_TOKEN_WINDOW]
+        token_ids = tokenizer.encode(window, disallowed_special=())
+        if len(token_ids) <= budget + _WINDOW_TOKEN_MARGIN and len(window) < len(content):
+            token_ids = tokenizer.encode(content, disallowed_special=())
+        
+        if len(token_ids) > budget:
+            content = tokenizer.decode(token_ids[:budget]) + truncation_marker
+        return content
     
     def _parse_structured_summary(self, raw_summary: str) -> Dict[str, Any]:
         """Parse structured summary with robust error handling and source extraction"""
-        logger.debug(f"Raw summary to parse: {raw_summary}")
+        logger.debug("Raw summary to parse: %s", raw_summary)
         
         result = {
             'tldr': '',
@@ -340,19 +1177,24 @@ class OllamaService(OllamaServiceInterface):
         try:
             # Clean up the input text - remove artifacts and normalize whitespace
             cleaned_summary = self._clean_raw_text(raw_summary)
-            logger.debug(f"Cleaned summary: {cleaned_summary}")
+            logger.debug("Cleaned summary: %s", cleaned_summary)
             
-            # Parse each section using robust extraction methods
-            self._extract_tldr_section(cleaned_summary, result)
-            self._extract_bullets_section(cleaned_summary, result)
-            self._extract_paragraph_section(cleaned_summary, result)
+            # Slice all sections in one pass, then parse each slice
+            sections = self._split_sections(cleaned_summary)
+            extractors = (
+                (self._extract_tldr_section, sections.get('TL;DR')),
+                (self._extract_bullets_section, sections.get('KEY POINTS')),
+                (self._extract_paragraph_section, sections.get('FULL SUMMARY'))
+            )
+            for extract, section in extractors:
+                extract(section, result)
             
             # If parsing completely fails, use intelligent fallback
             if not any([result['tldr'], result['bullets'], result['paragraph']]):
                 logger.warning("Primary parsing failed, using intelligent fallback")
                 self._apply_intelligent_fallback(raw_summary, result)
             
-            logger.debug(f"Final parsed result: {result}")
+            logger.debug("Final parsed result: %s", result)
             
         except Exception as e:
             logger.warning(f"Failed to parse structured summary: {e}")
@@ -363,11 +1205,11 @@ class OllamaService(OllamaServiceInterface):
     def _clean_raw_text(self, text: str) -> str:
         """Clean and normalize raw text"""
         # Remove termination tokens
-        text = re.sub(r'<\|[^|]*\|>', '', text)
+        text = _TERM_TOKEN_RE.sub('', text)
         # Remove duplicate newlines
-        text = re.sub(r'\n\s*\n+', '\n\n', text)
+        text = _MULTI_NEWLINE_RE.sub('\n\n', text)
         # Remove markdown headers at start of lines
-        text = re.sub(r'^#+\s+.*?\n', '', text, flags=re.MULTILINE)
+        text = _MD_HEADER_RE.sub('', text)
         return text.strip()
 
     def _extract_source_from_text(self, text: str) -> tuple[str, str]:
@@ -378,10 +1220,6 @@ class OllamaService(OllamaServiceInterface):
         original_text = text
         text = text.strip()
         
-        # Debug logging to see what's being processed
-        if '-' in text and len(text) < 200:
-            print(f"DEBUG: Processing text with hyphen: {repr(text)}")
-        
         # Look for sources in parentheses at the end
         if text.endswith(')') and '(' in text:
             # Find the last opening parenthesis
@@ -389,7 +1227,6 @@ class OllamaService(OllamaServiceInterface):
             if last_paren > 0:
                 source = text[last_paren+1:-1].strip()
                 cleaned_text = text[:last_paren].strip()
-                print(f"DEBUG: Found parentheses source: {repr(cleaned_text)} -> {repr(source)}")
                 return cleaned_text, source
         
         # Look for sources in brackets at the end
@@ -399,173 +1236,134 @@ class OllamaService(OllamaServiceInterface):
             if last_bracket > 0:
                 source = text[last_bracket+1:-1].strip()
                 cleaned_text = text[:last_bracket].strip()
-                print(f"DEBUG: Found bracket source: {repr(cleaned_text)} -> {repr(source)}")
                 return cleaned_text, source
         
         # No source found, return original text
         return text, ""
 
-    def _extract_tldr_section(self, text: str, result: dict):
-        """Extract TL;DR section with simple string operations"""
-        # Simple approach: find **TL;DR:** and get everything until next **section
-        if '**TL;DR:**' in text:
-            start_marker = '**TL;DR:**'
-            start_pos = text.find(start_marker)
-            if start_pos != -1:
-                # Get text after the marker
-                after_marker = text[start_pos + len(start_marker):].strip()
-                
-                # Find where it ends (at next ** section)
-                end_pos = after_marker.find('**KEY POINTS')
-                if end_pos == -1:
-                    end_pos = after_marker.find('**FULL SUMMARY')
-                if end_pos == -1:
-                    end_pos = after_marker.find('**SOURCES')
-                if end_pos == -1:
-                    # Use until newline or end
-                    end_pos = after_marker.find('\n')
-                    if end_pos == -1:
-                        tldr_text = after_marker.strip()
-                    else:
-                        tldr_text = after_marker[:end_pos].strip()
-                else:
-                    tldr_text = after_marker[:end_pos].strip()
-                
-                if tldr_text:
-                    # Clean and extract source
-                    cleaned_tldr, source = self._extract_source_from_text(tldr_text)
-                    
-                    if cleaned_tldr:
-                        result['tldr'] = cleaned_tldr
-                        result['sources']['tldr'] = source if source else "Content"
-                        return
-        
-        print("DEBUG: No **TL;DR:** section found")
-
-    def _extract_bullets_section(self, text: str, result: dict):
-        """Extract bullets section with simple string operations"""
-        # Simple approach: find **KEY POINTS:** and get bullet lines until next **section
-        if '**KEY POINTS:**' in text:
-            start_marker = '**KEY POINTS:**'
-            start_pos = text.find(start_marker)
-            if start_pos != -1:
-                # Get text after the marker
-                after_marker = text[start_pos + len(start_marker):].strip()
-                
-                # Find where it ends (at next ** section)
-                end_pos = after_marker.find('**FULL SUMMARY')
-                if end_pos == -1:
-                    end_pos = after_marker.find('**SOURCES')
-                if end_pos == -1:
-                    # Use the whole remaining text
-                    bullets_text = after_marker.strip()
-                else:
-                    bullets_text = after_marker[:end_pos].strip()
+    @staticmethod
+    def _split_sections(text: str) -> Dict[str, Tuple[str, bool]]:
+        """
+        Slice summary text into its sections with a single regex scan
+        
+        Args:
+            text: Cleaned summary text
+            
+        Returns:
+            {label: (body, terminated)} for the first occurrence of each section;
+            terminated is False when the section runs to the end of the text
+        """
+        sections = {}
+        pending = None  # (label, body start) of the open section
+        
+        for match in _SECTION_ANCHOR_RE.finditer(text):
+            if pending:
+                sections[pending[0]] = (text[pending[1]:match.start()].strip(), True)
+                pending = None
+            label = match.group(1)
+            if match.group(2) and label not in sections:
+                pending = (label, match.end())
+        
+        if pending:
+            sections[pending[0]] = (text[pending[1]:].strip(), False)
+        
+        return sections
+
+    def _extract_tldr_section(self, section: Optional[Tuple[str, bool]], result: dict):
+        """Extract TL;DR section from its slice"""
+        if section:
+            tldr_text, terminated = section
+            if not terminated:
+                # No following section - TL;DR is the first line only
+                tldr_text = tldr_text.partition('\n')[0].strip()
+            
+            if tldr_text:
+                # Clean and extract source
+                cleaned_tldr, source = self._extract_source_from_text(tldr_text)
                 
-                # Parse bullet lines
-                bullets, sources = self._parse_bullet_list(bullets_text)
-                if bullets:
-                    result['bullets'] = bullets
-                    result['sources']['bullets'] = sources
+                if cleaned_tldr:
+                    result['tldr'] = cleaned_tldr
+                    result['sources']['tldr'] = source if source else "Content"
                     return
         
-        print("DEBUG: No **KEY POINTS:** section found")
+        logger.debug("No **TL;DR:** section found")
+
+    def _extract_bullets_section(self, section: Optional[Tuple[str, bool]], result: dict):
+        """Extract bullets section from its slice"""
+        if section:
+            # Parse bullet lines
+            bullets, sources = self._parse_bullet_list(section[0])
+            if bullets:
+                result['bullets'] = bullets
+                result['sources']['bullets'] = sources
+                return
+        
+        logger.debug("No **KEY POINTS:** section found")
 
     def _parse_bullet_list(self, bullets_text: str) -> tuple[list, list]:
         """Parse bullet list text into bullets and sources"""
         cleaned_bullets = []
         bullet_sources = []
         
-        # Split into lines and process each potential bullet
-        lines = bullets_text.split('\n')
+        # Bullet lines (•, -, * or numbers) in one regex match per line; other lines are skipped
+        bullet_matches = map(_BULLET_LINE_RE.match, map(str.strip, bullets_text.split('\n')))
         
-        for line in lines:
-            line = line.strip()
-            if not line:
+        for match in bullet_matches:
+            if match is None:
                 continue
             
-            # Check for bullet markers (•, -, *, or numbers) - be more specific about dash
-            if line.startswith('- ') or line.startswith('• ') or line.startswith('* ') or re.match(r'^\d+\.\s', line):
-                # Extract the content after the bullet marker
-                if line.startswith('- '):
-                    bullet_content = line[2:].strip()
-                elif line.startswith('• '):
-                    bullet_content = line[2:].strip()
-                elif line.startswith('* '):
-                    bullet_content = line[2:].strip()
-                else:  # numbered list
-                    bullet_content = re.sub(r'^\d+\.\s*', '', line).strip()
-                
-                # Debug hyphen cutting
-                if '-' in bullet_content and len(bullet_content) < 100:
-                    print(f"DEBUG: Bullet content with hyphen: {repr(bullet_content)}")
-                
-                # Extract source and clean text
-                cleaned_text, source = self._extract_source_from_text(bullet_content)
-                
-                # Clean up markdown formatting
-                cleaned_text = re.sub(r'\*\*([^*]+)\*\*:\s*', r'\1: ', cleaned_text)
-                cleaned_text = re.sub(r'\*\*([^*]+)\*\*', r'\1', cleaned_text)
-                
-                # Handle source defaults - avoid Para X fallback
-                if not source:
-                    source = "Content"  # Simple default instead of Para X
-                elif source.lower() in ['source', 'sources']:
-                    # Look for section markers or use paragraph number
-                    section_markers = re.findall(r'\[SOURCE_MARKER:\s*([^]]+)\]', bullet_content)
-                    if section_markers:
-                        source = section_markers[-1].strip()
-                    else:
-                        para_num = len(cleaned_bullets) + 1
-                        source = f"Para {para_num}"
-                
-                # Only add if bullet has meaningful content
-                if cleaned_text and len(cleaned_text) > 5:
-                    cleaned_bullets.append(cleaned_text)
-                    bullet_sources.append(source)
+            # Extract the content after the bullet marker
+            bullet_content = match.group(1).strip()
+            
+            # Extract source and clean text
+            cleaned_text, source = self._extract_source_from_text(bullet_content)
+            
+            # Clean up markdown formatting
+            if '**' in cleaned_text:
+                cleaned_text = _BOLD_LABEL_RE.sub(r'\1: ', cleaned_text)
+                cleaned_text = _BOLD_RE.sub(r'\1', cleaned_text)
+            
+            # Handle source defaults - avoid Para X fallback
+            if not source:
+                source = "Content"  # Simple default instead of Para X
+            elif source.lower() in ['source', 'sources']:
+                # Look for section markers or use paragraph number
+                section_markers = _SOURCE_MARKER_RE.findall(bullet_content)
+                if section_markers:
+                    source = section_markers[-1].strip()
+                else:
+                    para_num = len(cleaned_bullets) + 1
+                    source = f"Para {para_num}"
+            
+            # Only add if bullet has meaningful content
+            if cleaned_text and len(cleaned_text) > 5:
+                cleaned_bullets.append(cleaned_text)
+                bullet_sources.append(source)
         
         return cleaned_bullets, bullet_sources
 
-    def _extract_paragraph_section(self, text: str, result: dict):
-        """Extract paragraph section with simple string operations"""
-        print(f"DEBUG: Extracting paragraph from text: {repr(text[:200])}...")
-        
-        # Simple approach: find **FULL SUMMARY:** and get everything until **SOURCES:**
-        if '**FULL SUMMARY:**' in text:
-            start_marker = '**FULL SUMMARY:**'
-            start_pos = text.find(start_marker)
-            if start_pos != -1:
-                # Get text after the marker
-                after_marker = text[start_pos + len(start_marker):].strip()
-                
-                # Find where it ends (at **SOURCES:** or end of text)
-                end_pos = after_marker.find('**SOURCES:')
-                if end_pos == -1:
-                    end_pos = after_marker.find('**SOURCES:**')
-                if end_pos == -1:
-                    # Use the whole remaining text
-                    paragraph_text = after_marker.strip()
-                else:
-                    paragraph_text = after_marker[:end_pos].strip()
-                
-                print(f"DEBUG: Extracted paragraph: {repr(paragraph_text[:100])}...")
+    def _extract_paragraph_section(self, section: Optional[Tuple[str, bool]], result: dict):
+        """Extract paragraph section from its slice"""
+        if section:
+            paragraph_text = section[0]
+            logger.debug("Extracted paragraph: %.100r...", paragraph_text)
+            
+            if paragraph_text:
+                # Just clean up basic artifacts
+                paragraph_text = paragraph_text.replace('<|file_separator|>', '').strip()
+                if paragraph_text and paragraph_text[-1] not in '.!?':
+                    paragraph_text = paragraph_text + '.'
                 
-                if paragraph_text:
-                    # Just clean up basic artifacts
-                    paragraph_text = paragraph_text.replace('<|file_separator|>', '').strip()
-                    if paragraph_text and paragraph_text[-1] not in '.!?':
-                        paragraph_text = paragraph_text + '.'
-                    
-                    result['paragraph'] = paragraph_text
-                    result['sources']['paragraph'] = ['Full Content']
-                    return
+                result['paragraph'] = paragraph_text
+                result['sources']['paragraph'] = ['Full Content']
+                return
         
-        print("DEBUG: No **FULL SUMMARY:** section found")
+        logger.debug("No **FULL SUMMARY:** section found")
 
     def _clean_paragraph_text(self, text: str) -> str:
         """Clean and format paragraph text without cutting content"""
         # Remove artifacts and clean formatting
-        text = re.sub(r'<\|[^|]*\|>', '', text)
+        text = _TERM_TOKEN_RE.sub('', text)
         text = text.strip()
         
         # Simply ensure text ends with proper punctuation if it doesn't already
@@ -576,12 +1374,12 @@ class OllamaService(OllamaServiceInterface):
 
     def _extract_paragraph_sources(self, text: str) -> list:
         """Extract sources from paragraph sources section"""
-        sources_match = re.search(r'\*\*SOURCES?:\*\*\s*(.*?)(?=\*\*|$)', text, re.DOTALL | re.IGNORECASE)
+        sources_match = _SOURCES_SECTION_RE.search(text)
         if not sources_match:
             return []
         
         sources_text = sources_match.group(1).strip()
-        sources_text = re.sub(r'<\|[^|]*\|>', '', sources_text).strip()
+        sources_text = _TERM_TOKEN_RE.sub('', sources_text).strip()
         
         if not sources_text:
             return []
@@ -590,23 +1388,23 @@ class OllamaService(OllamaServiceInterface):
         sources_list = []
         
         # Method 1: Bracketed sources [XX:XX:XX] or (Para X)
-        bracketed_sources = re.findall(r'\[([^\]]+)\]|\(([^)]+)\)', sources_text)
+        bracketed_sources = _BRACKETED_RE.findall(sources_text)
         if bracketed_sources:
             sources_list = [s[0] or s[1] for s in bracketed_sources if s[0] or s[1]]
         
         # Method 2: Bullet list format
-        elif re.search(r'(?:^|\n)\s*(?:[•\-\*]|\d+\.)', sources_text, re.MULTILINE):
-            bullet_sources = re.findall(r'(?:^|\n)\s*(?:[•\-\*]|\d+\.)\s*([^\n]+)', sources_text, re.MULTILINE)
+        elif _LIST_ITEM_RE.search(sources_text):
+            bullet_sources = _LIST_ITEM_RE.findall(sources_text)
             sources_list = [s.strip() for s in bullet_sources if s.strip()]
         
         # Method 3: Comma/semicolon separated
         else:
-            sources_list = [s.strip() for s in re.split(r'[,;]|\sand\s', sources_text) if s.strip()]
+            sources_list = [s.strip() for s in _SOURCE_SPLIT_RE.split(sources_text) if s.strip()]
         
         # Clean up sources
         cleaned_sources = []
         for source in sources_list:
-            source = re.sub(r'<\|[^|]*\|>', '', source).strip()
+            source = _TERM_TOKEN_RE.sub('', source).strip()
             if source and len(source) > 1:
                 cleaned_sources.append(source)
         
@@ -655,11 +1453,12 @@ class OllamaService(OllamaServiceInterface):
         result['sources']['bullets'] = ["Content" for _ in result['bullets']]
         result['sources']['paragraph'] = ["Full Content"]
     
-    def _create_fallback_summary(self, content: str) -> Dict[str, str]:
-        """Create fallback summary when AI processing fails"""
+    def _create_fallback_summary(self, content: str) -> Dict[str, Any]:
+        """Create fallback summary when AI processing fails (marked so it is never cached)"""
         preview = content[:200] + "..." if len(content) > 200 else content
         
         return {
+            'fallback': True,
             'tldr': "Content loaded successfully but AI summary unavailable.",
             'bullets': [
                 "File content extracted",
@@ -671,26 +1470,37 @@ class OllamaService(OllamaServiceInterface):
     
     def _format_summary(self, summary: str) -> str:
         """Format summary for ADHD-friendly presentation"""
-        lines = summary.strip().split('\n')
-        formatted_lines = []
-        
-        for line in lines:
-            line = line.strip()
-            if line:
-                # Ensure bullet points are consistent
-                if line.startswith('•') or line.startswith('-') or line.startswith('*'):
-                    if not line.startswith('• '):
-                        line = '• ' + line.lstrip('•-* ')
-                formatted_lines.append(line)
-        
-        return '\n'.join(formatted_lines)
+        # Strip every line and drop blanks, then make bullet markers consistent
+        text = _LINE_BREAKS_RE.sub('\n', summary.strip())
+        if len(text) > _NUMBA_FORMAT_THRESHOLD:
+            normalize = _get_numba_normalize()
+            if normalize:
+                return normalize(text)
+        return _BULLET_NORM_RE.sub('• ', text)
     
     def is_healthy(self) -> bool:
-        """Check if Ollama service is healthy"""
+        """Check if Ollama service is healthy (result cached for health_ttl_seconds)"""
+        now = time.monotonic()
+        checked_at, healthy = self._health_cache
+        if now - checked_at < self._health_ttl:
+            return healthy
+        
+        healthy = self._check_health()
+        self._health_cache = (now, healthy)
+        return healthy
+    
+    def _check_health(self) -> bool:
+        """Probe /api/tags and require at least one installed model"""
         try:
-            # Try to list models as health check
-            models = self.client.list()
-            return len(models.get('models', [])) > 0
+            import httpx
+            
+            response = httpx.get(f"{self._host}/api/tags", timeout=2.0)
+            response.raise_for_status()
+            data = response.json()
+            
+            # Handle both list and object shaped payloads
+            models = getattr(data, 'models', None) or (data.get('models', []) if isinstance(data, dict) else data)
+            return len(models) > 0
             
         except Exception as e:
             logger.error(f"Health check failed: {e}")
@@ -698,9 +1508,13 @@ class OllamaService(OllamaServiceInterface):
     
     def get_available_models(self) -> List[ModelInfo]:
         """Get list of available models"""
+        self._ensure_models()
         return list(self._models_cache.values())
     
     def reload_models(self):
         """Reload available models"""
-        self._models_cache.clear()
+        # _setup_models publishes a fresh snapshot; readers keep the old one until then
+        with self._model_lock:
+            self._sys_ctx = {}  # Contexts are tied to the model build that produced them
+            self._models_loaded = True
         self._setup_models()
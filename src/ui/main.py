@@ -1,852 +1,1160 @@
-import flet as ft
-import json
-import time
-import sys
-import os
-import asyncio
-import threading
-from pathlib import Path
-from typing import Dict, Any
-
-# Add the project root to the path so we can import from src
-project_root = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(project_root))
-
-# Import TTS functionality with fallback for direct execution
-try:
-    from .tts_manager import tts_manager
-    from .tts_components import create_tts_controls_panel, create_tts_unavailable_panel
-except ImportError:
-    # Fallback for direct script execution
-    from tts_manager import tts_manager
-    from tts_components import create_tts_controls_panel, create_tts_unavailable_panel
-
-# Global backend container - initialize once for performance
-backend_container = None
-processing_lock = threading.Lock()
-
-def initialize_backend():
-    """Initialize the backend once for fast response times"""
-    global backend_container
-    if backend_container is None:
-        try:
-            print("Initializing backend...")
-            # Check if we're running from executable
-            import sys
-            if getattr(sys, 'frozen', False):
-                print("Running from executable - adjusting paths...")
-                # We're running from PyInstaller bundle
-                import os
-                bundle_dir = sys._MEIPASS
-                sys.path.insert(0, bundle_dir)
-                print(f"Bundle directory: {bundle_dir}")
-            
-            # Check if Ollama is running
-            import subprocess
-            try:
-                result = subprocess.run(["ollama", "list"], 
-                                      capture_output=True, text=True, timeout=10)
-                if result.returncode != 0:
-                    raise Exception("Ollama service not running")
-                print("Ollama service verified")
-            except FileNotFoundError:
-                raise Exception("Ollama not found in PATH")
-            except Exception as e:
-                raise Exception(f"Ollama check failed: {e}")
-            
-            # Initialize bootstrap with error handling
-            try:
-                from src.bootstrap import get_bootstrap
-                bootstrap = get_bootstrap()
-                print("Bootstrap loaded")
-            except ImportError as e:
-                print(f"Bootstrap import failed: {e}")
-                # Try alternative import for executable
-                try:
-                    import bootstrap
-                    bootstrap = bootstrap.get_bootstrap()
-                    print("Bootstrap loaded (alternative path)")
-                except Exception as e2:
-                    raise Exception(f"Could not import bootstrap: {e}, {e2}")
-            
-            # Perform health check
-            try:
-                if not bootstrap.health_check():
-                    raise Exception("Backend health check failed")
-                print("Health check passed")
-            except Exception as e:
-                raise Exception(f"Health check error: {e}")
-            
-            backend_container = bootstrap
-            print("Backend initialized and ready")
-            
-        except ImportError as e:
-            error_msg = f"Backend import failed: {e}"
-            print(f"{error_msg}")
-            print("Running in standalone mode without AI processing")
-            backend_container = None
-        except Exception as e:
-            error_msg = f"Backend initialization failed: {e}"
-            print(f"{error_msg}")
-            print("Make sure Ollama service is running: ollama serve")
-            print("Try running the Python version: python src\\ui\\main.py <file>")
-            backend_container = None
-    return backend_container
-
-def process_file_with_backend(file_path):
-    """Process file using the initialized backend"""
-    try:
-        bootstrap = initialize_backend()
-        if not bootstrap:
-            raise Exception("Backend not available")
-        
-        print(f"Processing file with backend: {file_path}")
-        
-        # Get content processor from bootstrap
-        content_processor = bootstrap.get_content_processor()
-        
-        # Process file and get structured results
-        result = content_processor.process_file(file_path)
-        
-        if not result.get('success', False):
-            raise Exception(result.get('error', 'Processing failed'))
-        
-        # Extract structured summary data
-        structured_summary = result.get('structured_summary', {})
-        content = result.get('content', '')
-        
-        # Handle both old and new format for compatibility
-        if structured_summary:
-            tldr = structured_summary.get('tldr', '').strip()
-            bullets = structured_summary.get('bullets', [])
-            paragraph = structured_summary.get('paragraph', '').strip()
-            sources = structured_summary.get('sources', {})
-            
-            # Clean bullets to prevent text cutting
-            if isinstance(bullets, list):
-                bullets = [bullet.strip() for bullet in bullets if bullet and bullet.strip()]
-        else:
-            # Fallback to old format
-            summary = result.get('summary', '')
-            sentences = summary.split('. ')[:3]
-            tldr = summary[:200] + "..." if len(summary) > 200 else summary
-            bullets = [sentence.strip() + '.' for sentence in sentences if sentence.strip()]
-            paragraph = summary
-            sources = {'tldr': '', 'bullets': [], 'paragraph': []}
-        
-        return {
-            "file_path": file_path,
-            "extension": Path(file_path).suffix,
-            "summaries": {
-                "tldr": tldr,
-                "bullets": bullets,
-                "paragraph": paragraph,
-                "sources": sources
-            },
-            "file_content": content[:2000] + "..." if len(content) > 2000 else content,
-            "backend_used": True,
-            "processing_time": result.get('metadata', {}).get('processing_time', 0)
-        }
-        
-    except Exception as e:
-        print(f"Backend processing failed: {e}")
-        # Fallback to file info display
-        return get_file_info_fallback(file_path, str(e))
-
-def get_file_info_fallback(file_path, error_message=""):
-    """Enhanced fallback with fast processing for immediate feedback"""
-    if not file_path or not os.path.exists(file_path):
-        return DUMMY_DATA
-    
-    file_path = Path(file_path)
-    
-    try:
-        # Use fast processor for immediate results
-        from src.utils.fast_processor import fast_file_validation, fast_extract_text_content, is_text_file, is_audio_file, is_video_file, create_quick_summary
-        
-        # Quick validation
-        validation = fast_file_validation(str(file_path))
-        if not validation.get("valid", False):
-            return create_error_fallback(str(file_path), validation.get("error", "Unknown error"))
-        
-        file_size = validation["size"]
-        size_mb = file_size / (1024 * 1024)
-        
-        # Fast content extraction for text files
-        if is_text_file(str(file_path)):
-            content = fast_extract_text_content(str(file_path))
-            quick_summary = create_quick_summary(content, str(file_path))
-            
-            return {
-                "file_path": str(file_path.absolute()),
-                "extension": file_path.suffix,
-                "summaries": quick_summary,
-                "file_content": content[:2000] + "..." if len(content) > 2000 else content,
-                "backend_used": False,
-                "processing_time": 0.1  # Very fast
-            }
-        elif is_audio_file(str(file_path)) or is_video_file(str(file_path)):
-            # Audio and video files - show informational summary
-            quick_summary = create_quick_summary("", str(file_path))
-            media_type = "audio" if is_audio_file(str(file_path)) else "video"
-            
-            return {
-                "file_path": str(file_path.absolute()),
-                "extension": file_path.suffix,
-                "summaries": quick_summary,
-                "file_content": f"{media_type.title()} file: {file_path.name}\nSize: {size_mb:.2f} MB\nType: {file_path.suffix.upper()}\n\nTo view transcribed content, ensure the AI backend is running and try again. The system will automatically extract speech content and provide ADHD-friendly summaries.",
-                "backend_used": False,
-                "processing_time": 0.05
-            }
-        else:
-            # Non-text file
-            return {
-                "file_path": str(file_path.absolute()),
-                "extension": file_path.suffix,
-                "summaries": {
-                    "tldr": f"Binary file '{file_path.name}' ({size_mb:.2f} MB)",
-                    "bullets": [
-                        f"📁 File: {file_path.name}",
-                        f"📊 Size: {size_mb:.2f} MB ({file_size:,} bytes)",
-                        f"📄 Type: {file_path.suffix.upper()} file",
-                        "ℹ️ Binary file - content preview not available"
-                    ],
-                    "paragraph": f"This is a binary file named '{file_path.name}' with a size of {size_mb:.2f} MB. The file type is {file_path.suffix.upper()}. For AI-powered analysis of this file type, ensure the backend services are running and the file type is supported."
-                },
-                "file_content": f"Binary file: {file_path.name}\nSize: {size_mb:.2f} MB\nType: {file_path.suffix.upper()}\n\nContent preview not available for binary files.",
-                "backend_used": False,
-                "processing_time": 0.05
-            }
-    except Exception as e:
-        return create_error_fallback(str(file_path), str(e))
-
-def create_error_fallback(file_path: str, error: str) -> Dict[str, Any]:
-    """Create error fallback result"""
-    return {
-        "file_path": file_path,
-        "extension": ".txt",
-        "summaries": {
-            "tldr": f"Could not process file: {error[:100]}",
-            "bullets": [
-                "❌ File processing failed",
-                f"Error: {error[:50]}...",
-                "Try using the Python version directly"
-            ],
-            "paragraph": f"An error occurred while trying to process the file: {error}"
-        },
-        "file_content": f"Error reading file: {error}",
-        "backend_used": False,
-        "processing_time": 0
-    }
-
-def create_loading_page(page: ft.Page, file_name: str = None) -> ft.Container:
-    """Create an animated loading page"""
-    
-    file_text = f"Processing {file_name}..." if file_name else "Initializing Prism..."
-    
-    # Create progress ring
-    progress_ring = ft.ProgressRing(width=50, height=50, stroke_width=4)
-    
-    # Create loading messages that cycle
-    loading_messages = [
-        "🔍 Analyzing content...",
-        "🧠 Generating neurodivergent-friendly summary...",
-        "📝 Creating key points...",
-        "✨ Almost ready..."
-    ]
-    
-    loading_text = ft.Text(
-        loading_messages[0],
-        size=16,
-        text_align=ft.TextAlign.CENTER,
-        italic=True
-    )
-    
-    # Create loading container
-    loading_container = ft.Container(
-        content=ft.Column([
-            ft.Text(
-                file_text,
-                size=24,
-                weight="bold",
-                text_align=ft.TextAlign.CENTER,
-                color="#0D47A1"
-            ),
-            ft.Container(height=20),  # Spacer
-            progress_ring,
-            ft.Container(height=20),  # Spacer
-            loading_text,
-            ft.Container(height=20),  # Spacer
-            ft.Text(
-                "⚡ Using optimized AI processing for faster results",
-                size=12,
-                text_align=ft.TextAlign.CENTER,
-                color="#666",
-                italic=True
-            )
-        ],
-        horizontal_alignment=ft.CrossAxisAlignment.CENTER,
-        spacing=10
-        ),
-        alignment=ft.alignment.center,
-        expand=True,
-        padding=50
-    )
-    
-    # Animate loading text
-    def update_loading_message():
-        import random
-        if loading_text:
-            loading_text.value = random.choice(loading_messages)
-            page.update()
-    
-    # Update loading message every 2 seconds
-    def loading_animation():
-        for i in range(10):  # Run for 20 seconds max
-            if loading_text:
-                time.sleep(2)
-                update_loading_message()
-            else:
-                break
-    
-    # Start animation in background
-    threading.Thread(target=loading_animation, daemon=True).start()
-    
-    return loading_container
-
-def process_file_async(file_path: str, page: ft.Page, callback):
-    """Process file asynchronously and call callback when done"""
-    def worker():
-        with processing_lock:
-            try:
-                print(f"🚀 Starting async processing for: {file_path}")
-                start_time = time.time()
-                
-                # Process the file
-                result = process_file_with_backend(file_path)
-                
-                processing_time = time.time() - start_time
-                result['actual_processing_time'] = processing_time
-                
-                # print(f"✅ Processing completed in {processing_time:.2f}s")
-                
-                # Call the callback with results
-                callback(result, None)
-                
-            except Exception as e:
-                print(f"❌ Async processing failed: {e}")
-                callback(None, str(e))
-    
-    # Start processing in background thread
-    thread = threading.Thread(target=worker, daemon=True)
-    thread.start()
-    return thread
-DUMMY_DATA = {
-    "file_path": "C:/Users/aryah/Documents/sample_document.pdf",
-    "extension": ".pdf",
-    "summaries": {
-        "tldr": "Quickly explains the core ideas behind attention strategies.",
-        "bullets": [
-            "Defines ADHD in simple terms",
-            "Lists common behavioral patterns",
-            "Shares techniques for improved focus"
-        ],
-        "paragraph": "The document gives a concise yet informative overview of Attention Deficit Hyperactivity Disorder (ADHD). "
-            "It highlights symptoms, diagnosis methods, and behavioral therapy options for individuals, especially children. "
-            "The emphasis is on early detection and practical coping mechanisms to manage attention-related challenges effectively."
-    },
-    "file_content": (
-        "ADHD stands for Attention Deficit Hyperactivity Disorder. It is a neurological disorder that affects a person’s "
-        "ability to focus, control impulses, and maintain attention. Children and adults with ADHD often struggle with "
-        "organization and time management. This guide walks through essential ADHD symptoms, diagnosis procedures, and coping "
-        "strategies such as creating structured environments, using reminders, and building positive routines."
-    )
-}
-
-def main(page: ft.Page):
-    page.title = "Prism"
-    page.scroll = "auto"
-    page.window_width = 900
-    page.window_height = 800
-    page.fonts = {"lexend": "https://fonts.googleapis.com/css2?family=Lexend&display=swap"}
-    page.theme_mode = ft.ThemeMode.LIGHT
-    page.padding = 20
-    page.bgcolor = "#FAFAFA"
-
-    # Get file path from command line arguments (from context menu)
-    file_path = None
-    if len(sys.argv) > 1:
-        file_path = sys.argv[1]
-        print(f"File received from context menu: {file_path}")
-    else:
-        print("No file provided - using demo data")
-
-    # Initialize backend in the background (non-blocking)
-    print("Starting backend initialization...")
-    initialize_backend()
-
-    # State variables for async processing
-    content_data = {"value": None}
-    is_loading = {"value": True}
-    summaries_controls = []  # Store summary controls for font size updates
-    
-    # Create loading page initially
-    file_name = Path(file_path).name if file_path else None
-    loading_container = create_loading_page(page, file_name)
-    
-    # Font size and theme settings
-    font_size_slider = ft.Slider(
-        min=12, 
-        max=24, 
-        divisions=6, 
-        label="{value}px", 
-        value=16,
-        active_color="#1976D2",
-        thumb_color="#1976D2"
-    )
-    
-    theme_switch = ft.Switch(
-        label="Dark Mode",
-        active_color="#1976D2"
-    )
-
-    paragraph_visible = ft.Ref[ft.Text]()
-    toggle_btn = ft.Ref[ft.ElevatedButton]()
-    tts_container_ref = ft.Ref[ft.Container]()
-
-    def toggle_paragraph(e):
-        if paragraph_visible.current:
-            # Toggle visibility of the paragraph container
-            is_visible = not paragraph_visible.current.visible
-            paragraph_visible.current.visible = is_visible
-            
-            # Also toggle TTS controls visibility
-            if tts_container_ref.current:
-                tts_container_ref.current.visible = is_visible
-            
-            if toggle_btn.current:
-                if is_visible:
-                    toggle_btn.current.text = "Hide Full Summary"
-                    toggle_btn.current.icon = ft.Icons.EXPAND_LESS
-                else:
-                    toggle_btn.current.text = "Show Full Summary"
-                    toggle_btn.current.icon = ft.Icons.EXPAND_MORE
-            page.update()
-
-    def change_theme(e):
-        page.theme_mode = ft.ThemeMode.DARK if theme_switch.value else ft.ThemeMode.LIGHT
-        page.bgcolor = "#1E1E1E" if theme_switch.value else "#FAFAFA"
-        # Rebuild UI to update all colors
-        if content_data["value"]:
-            build_content_ui(content_data["value"])
-        else:
-            page.update()
-
-    def update_font_size(e):
-        for ctrl in summaries_controls:
-            if ctrl:
-                ctrl.size = font_size_slider.value
-        page.update()
-
-    def create_card(content, padding=20):
-        """Create a Streamlit-like card container"""
-        card_bg = "#FFFFFF" if page.theme_mode == ft.ThemeMode.LIGHT else "#23272F"
-        card_border = "#E0E0E0" if page.theme_mode == ft.ThemeMode.LIGHT else "#444851"
-        return ft.Container(
-            content=content,
-            padding=padding,
-            margin=ft.margin.only(bottom=20),
-            bgcolor=card_bg,
-            border_radius=12,
-            shadow=ft.BoxShadow(
-                spread_radius=0,
-                blur_radius=8,
-                color=ft.Colors.with_opacity(0.1, "#000000"),
-                offset=ft.Offset(0, 2),
-            ),
-            border=ft.border.all(1, card_border)
-        )
-
-    def create_section_header(text, icon=""):
-        """Create a consistent section header"""
-        return ft.Row([
-            ft.Text(
-                f"{icon} {text}",
-                size=22,
-                weight="bold",
-                font_family="lexend",
-                color="#1976D2"
-            )
-        ], alignment=ft.MainAxisAlignment.START)
-
-    def build_content_ui(data):
-        """Build the main content UI with processed data"""
-        page.controls.clear()  # Clear loading screen
-        
-        # Main container for all content
-        main_container = ft.Column(
-            controls=[],
-            spacing=0,
-            expand=True
-        )
-        
-        # Header section
-        welcome_text = "Prism"
-        if file_path:
-            file_name = Path(file_path).name
-            welcome_text = f"Prism\n{file_name}"
-        
-        header_text_color = "#1976D2" if page.theme_mode == ft.ThemeMode.LIGHT else "#FFB74D"
-        status_color = "#4CAF50" if data.get("backend_used", False) else ("#FF9800" if page.theme_mode == ft.ThemeMode.LIGHT else "#FFD54F")
-        header_card = create_card(
-            ft.Column([
-                ft.Text(
-                    welcome_text,
-                    size=36,
-                    weight="bold",
-                    font_family="lexend",
-                    color=header_text_color,
-                    text_align=ft.TextAlign.CENTER
-                ),
-                ft.Container(height=10),
-                # Enhanced status indicator
-                ft.Row([
-                    ft.Icon(
-                        ft.Icons.SMART_TOY if data.get("backend_used", False) else ft.Icons.DASHBOARD,
-                        color=status_color,
-                        size=20
-                    ),
-                    ft.Text(
-                        f"Processed with AI Backend ({data.get('actual_processing_time', 0):.1f}s)" 
-                        if data.get("backend_used", False) 
-                        else "Demo Mode / Backend Unavailable",
-                        size=14,
-                        color=status_color,
-                        font_family="lexend"
-                    )
-                ], alignment=ft.MainAxisAlignment.CENTER)
-            ], horizontal_alignment=ft.CrossAxisAlignment.CENTER),
-            padding=30
-        )
-        main_container.controls.append(header_card)
-
-        # Settings card
-        settings_card = create_card(
-            ft.Column([
-                create_section_header("Settings", "⚙️"),
-                ft.Container(height=15),
-                ft.Row([
-                    ft.Container(
-                        ft.Row([
-                            ft.Text("Font Size:", font_family="lexend", weight="w500"),
-                            ft.Container(width=10),
-                            ft.Container(
-                                font_size_slider,
-                                expand=True
-                            )
-                        ]),
-                        expand=True
-                    ),
-                    ft.Container(width=30),
-                    theme_switch
-                ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN)
-            ])
-        )
-        main_container.controls.append(settings_card)
-        
-        # File info card
-        label_color = "#666666" if page.theme_mode == ft.ThemeMode.LIGHT else "#BDBDBD"
-        value_color = "#2E2E2E" if page.theme_mode == ft.ThemeMode.LIGHT else "#F5F5F5"
-        file_info_card = create_card(
-            ft.Column([
-                create_section_header("File Information", "📄"),
-                ft.Container(height=15),
-                ft.Container(
-                    ft.Column([
-                        ft.Row([
-                            ft.Text("File:", weight="bold", font_family="lexend", color=label_color),
-                            ft.Text(Path(data["file_path"]).name, font_family="lexend", color=value_color)
-                        ]),
-                        ft.Row([
-                            ft.Text("Type:", weight="bold", font_family="lexend", color=label_color),
-                            ft.Text(data["extension"].upper(), font_family="lexend", color=value_color)
-                        ]),
-                        ft.Row([
-                            ft.Text("AI Processed:", weight="bold", font_family="lexend", color=label_color),
-                            ft.Text("Yes" if data.get("backend_used", False) else "No", font_family="lexend", color=value_color)
-                        ])
-                    ], spacing=8),
-                    padding=15,
-                    bgcolor="#F8F9FA" if page.theme_mode == ft.ThemeMode.LIGHT else "#383838",
-                    border_radius=8
-                )
-            ])
-        )
-        main_container.controls.append(file_info_card)
-
-        # Clear summaries controls for new content
-        summaries_controls.clear()
-
-        # TL;DR card with source reference
-        tldr_text = ft.Text(
-            data["summaries"]["tldr"],
-            font_family="lexend",
-            size=font_size_slider.value,
-            color="#2E2E2E" if page.theme_mode == ft.ThemeMode.LIGHT else "#FFECB3"
-        )
-        
-        tldr_container = ft.Column([
-            create_section_header("TL;DR", "📌"),
-            ft.Container(height=15),
-            tldr_text
-        ])
-        
-        # Add source reference if available
-        if "sources" in data["summaries"] and data["summaries"]["sources"].get("tldr"):
-            source_ref = ft.Text(
-                f"Source: {data['summaries']['sources']['tldr']}",
-                font_family="lexend",
-                size=12,
-                italic=True,
-                color="#1976D2"
-            )
-            tldr_container.controls.append(ft.Container(height=8))
-            tldr_container.controls.append(source_ref)
-        
-        tldr_card = create_card(tldr_container)
-        main_container.controls.append(tldr_card)
-        summaries_controls.append(tldr_text)
-
-        # Key points card with source references
-        bullet_controls = []
-        bullet_column = ft.Column([], spacing=12)
-        
-        for i, point in enumerate(data["summaries"]["bullets"], 1):
-            # Create point text with source reference if available
-            point_text = point
-            source_ref = None
-            if "sources" in data["summaries"] and data["summaries"]["sources"].get("bullets"):
-                bullet_sources = data["summaries"]["sources"]["bullets"]
-                if isinstance(bullet_sources, list) and len(bullet_sources) >= i:
-                    source_ref = bullet_sources[i-1]
-            
-            bullet_content = ft.Column([
-                ft.Row([
-                    ft.Container(
-                        ft.CircleAvatar(
-                            content=ft.Text(str(i), size=12, weight="bold", color="#FFFFFF"),
-                            bgcolor="#1976D2" if page.theme_mode == ft.ThemeMode.LIGHT else "#FFB300",
-                            radius=12
-                        )
-                    ),
-                    ft.Container(width=10),
-                    ft.Text(
-                        point_text,
-                        font_family="lexend",
-                        size=font_size_slider.value,
-                        expand=True,
-                        color="#2E2E2E" if page.theme_mode == ft.ThemeMode.LIGHT else "#FFECB3"
-                    )
-                ])
-            ])
-            
-            # Add source reference if available
-            if source_ref:
-                bullet_content.controls.append(
-                    ft.Container(
-                        content=ft.Text(
-                            f"Source: {source_ref}",
-                            font_family="lexend",
-                            size=11,
-                            italic=True,
-                            color="#1976D2"
-                        ),
-                        margin=ft.margin.only(left=34, top=2)
-                    )
-                )
-            
-            bullet_column.controls.append(bullet_content)
-            # Find the text component to add to controls
-            text_component = bullet_content.controls[0].controls[2]
-            bullet_controls.append(text_component)
-            summaries_controls.append(text_component)
-
-        key_points_card = create_card(
-            ft.Column([
-                create_section_header("Key Points", "🔹"),
-                ft.Container(height=15),
-                bullet_column
-            ])
-        )
-        main_container.controls.append(key_points_card)
-
-        # Full summary card (collapsible) with TTS controls positioned to the right
-        # Create full summary text with source references
-        summary_container = ft.Column([
-            ft.Text(
-                data["summaries"]["paragraph"],
-                font_family="lexend",
-                size=font_size_slider.value,
-                visible=False,
-                ref=paragraph_visible,
-                color="#2E2E2E" if page.theme_mode == ft.ThemeMode.LIGHT else "#FFECB3"
-            )
-        ])
-
-        # Add source references if available
-        if "sources" in data["summaries"] and data["summaries"]["sources"].get("paragraph"):
-            sources = data["summaries"]["sources"]["paragraph"]
-            if isinstance(sources, (list, str)):
-                source_text = (
-                    f"Sources: {sources}" if isinstance(sources, str)
-                    else f"Sources: {', '.join(sources)}"
-                )
-                source_ref = ft.Container(
-                    content=ft.Text(
-                        source_text,
-                        font_family="lexend",
-                        size=12,
-                        italic=True,
-                        color="#1976D2",
-                        visible=False  # Initially hidden like the paragraph
-                    ),
-                    margin=ft.margin.only(top=10)
-                )
-                summary_container.controls.append(source_ref)
-        
-        paragraph_text = summary_container
-        
-        toggle_button = ft.ElevatedButton(
-            "Show Full Summary",
-            ref=toggle_btn,
-            on_click=toggle_paragraph,
-            style=ft.ButtonStyle(
-                bgcolor="#1976D2",
-                color="#FFFFFF",
-                shape=ft.RoundedRectangleBorder(radius=8)
-            ),
-            icon=ft.Icons.EXPAND_MORE
-        )
-        
-        # Create TTS controls using the separate component
-        tts_controls = create_tts_controls_panel(
-            data=data,
-            paragraph_visible=paragraph_visible,
-            page=page,
-            theme_mode=page.theme_mode
-        ) if tts_manager.is_available else create_tts_unavailable_panel(page.theme_mode)
-        
-        # Full summary content with TTS positioned to the right when expanded
-        full_summary_content = ft.Column([
-            create_section_header("Full Summary", "📋"),
-            ft.Container(height=15),
-            
-            # Toggle button row
-            ft.Row([
-                toggle_button,
-            ], alignment=ft.MainAxisAlignment.START),
-            
-            ft.Container(height=10),
-            
-            # Content and TTS side by side when expanded
-            ft.Row([
-                # Left side: paragraph text
-                ft.Container(
-                    content=paragraph_text,
-                    expand=True,
-                    padding=ft.padding.only(right=20)
-                ),
-                # Right side: TTS controls (only visible when paragraph is visible)
-                ft.Container(
-                    content=tts_controls,
-                    visible=False,  # Will be controlled by toggle
-                    ref=tts_container_ref
-                )
-            ], alignment=ft.MainAxisAlignment.START, vertical_alignment=ft.CrossAxisAlignment.START)
-        ])
-        
-        full_summary_card = create_card(full_summary_content)
-        main_container.controls.append(full_summary_card)
-        summaries_controls.append(paragraph_text)
-
-        # File content card
-        file_content_bg = "#F8F9FA" if page.theme_mode == ft.ThemeMode.LIGHT else "#181A20"
-        file_content_text = "#2E2E2E" if page.theme_mode == ft.ThemeMode.LIGHT else "#F5F5F5"
-        content_card = create_card(
-            ft.Column([
-                create_section_header("File Content", "📘"),
-                ft.Container(height=15),
-                ft.Container(
-                    ft.Text(
-                        data["file_content"],
-                        font_family="Consolas",
-                        size=14,
-                        selectable=True,
-                        color=file_content_text
-                    ),
-                    padding=20,
-                    bgcolor=file_content_bg,
-                    border_radius=8,
-                    border=ft.border.all(1, "#E0E0E0" if page.theme_mode == ft.ThemeMode.LIGHT else "#444851")
-                )
-            ])
-        )
-        main_container.controls.append(content_card)
-        
-        # Set up event handlers
-        theme_switch.on_change = change_theme
-        font_size_slider.on_change = update_font_size
-        
-        page.add(main_container)
-        page.update()
-
-    def on_processing_complete(result, error):
-        """Callback when async processing completes"""
-        if error:
-            # Handle error case
-            error_data = get_file_info_fallback(file_path, error)
-            build_content_ui(error_data)
-        else:
-            # Handle success case
-            content_data["value"] = result
-            is_loading["value"] = False
-            build_content_ui(result)
-
-    # Show loading screen initially
-    page.add(loading_container)
-    page.update()
-
-    # Start processing
-    if file_path and os.path.exists(file_path):
-        # Process file asynchronously
-        process_file_async(file_path, page, on_processing_complete)
-    else:
-        # Use demo data immediately
-        demo_data = DUMMY_DATA.copy()
-        demo_data["backend_used"] = False
-        demo_data["actual_processing_time"] = 0
-        
-        # Simulate brief loading for demo
-        def show_demo():
-            time.sleep(1)
-            on_processing_complete(demo_data, None)
-        
-        threading.Thread(target=show_demo, daemon=True).start()
-
-if __name__ == "__main__":
-    # Use ASCII-safe messages for Windows console compatibility
-    try:
-        print("Starting Prism...")
-        if len(sys.argv) > 1:
-            print(f"File from context menu: {sys.argv[1]}")
-        else:
-            print("Running in demo mode")
-    except UnicodeEncodeError:
-        # Fallback to ASCII-safe messages
-        print("Starting Prism...")
-        if len(sys.argv) > 1:
-            print(f"File from context menu: {sys.argv[1]}")
-        else:
-            print("Running in demo mode")
-    
-    ft.app(target=main)
+import json
+import time
+import sys
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Any, TYPE_CHECKING
+
+# Flet, TTS and the backend are imported where they are used to keep startup light
+if TYPE_CHECKING:
+    import flet as ft
+
+# Add the project root to the path so we can import from src
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+# Global backend container - initialize once for performance
+backend_container = None
+backend_ready = threading.Event()  # Set once initialization finished (successfully or not)
+_backend_init_thread = None
+_backend_init_lock = threading.Lock()
+# In-flight processing task per (file, refresh) - duplicate requests await the same task
+_in_flight = {}
+# Concurrent backend runs for different files (raise for multi-GPU / parallel Ollama setups)
+BACKEND_CONCURRENCY = max(1, int(os.environ.get("PRISM_CONCURRENCY", "1")))
+_backend_semaphore = None
+BACKEND_READY_TIMEOUT_SECONDS = 30
+OLLAMA_READY_TIMEOUT_SECONDS = 3
+FONT_SIZE_DEBOUNCE_SECONDS = 0.1
+
+OLLAMA_URL = os.environ.get("OLLAMA_HOST", "http://127.0.0.1:11434")
+if not OLLAMA_URL.startswith("http"):
+    OLLAMA_URL = f"http://{OLLAMA_URL}"
+_http_session = None
+
+def get_http_session():
+    """Shared requests session so Ollama calls reuse pooled keep-alive connections"""
+    global _http_session
+    if _http_session is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8,
+                              max_retries=Retry(total=2, backoff_factor=0.1))
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        _http_session = session
+    return _http_session
+
+def _ollama_alive():
+    """Check that the Ollama daemon answers on /api/tags"""
+    try:
+        # Short connect timeout - a local daemon that is up accepts immediately
+        return get_http_session().get(f"{OLLAMA_URL}/api/tags", timeout=(0.5, 2)).ok
+    except Exception:
+        return False
+
+# Last successful backend result, painted immediately when the same file is reopened
+LAST_RESULT_CACHE = Path.home() / ".cache" / "prism" / "last_result.json"
+
+# Backend results by SHA-256 of the file bytes - survives renames and copies
+CONTENT_RESULT_CACHE_DIR = Path.home() / ".cache" / "prism" / "results"
+CONTENT_RESULT_CACHE_MAX_ENTRIES = 256
+CONTENT_RESULT_CACHE_MAX_AGE_SECONDS = 7 * 24 * 3600
+
+def compute_file_hash(file_path, chunk_size=64 * 1024):
+    """SHA-256 hex digest of a file, read in chunks"""
+    import hashlib
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _content_cache_key(file_path, ollama_service):
+    """Content cache key - file bytes plus the model/prompt fingerprint (None if unreadable)"""
+    try:
+        content_hash = compute_file_hash(file_path)
+    except OSError:
+        return None
+    return f"{content_hash}-{ollama_service.summary_cache_tag()}"
+
+def _load_content_result(cache_key):
+    """Stored backend result for this key, or None (expired entries are removed)"""
+    entry = CONTENT_RESULT_CACHE_DIR / f"{cache_key}.json"
+    try:
+        if time.time() - entry.stat().st_mtime > CONTENT_RESULT_CACHE_MAX_AGE_SECONDS:
+            entry.unlink()
+            return None
+        result = json.loads(entry.read_text(encoding="utf-8"))
+        os.utime(entry)  # mtime tracks last use for LRU eviction
+        return result
+    except (OSError, ValueError):
+        return None
+
+def _save_content_result(cache_key, result):
+    """Store a backend result under its content cache key, then bound the cache"""
+    try:
+        CONTENT_RESULT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        (CONTENT_RESULT_CACHE_DIR / f"{cache_key}.json").write_text(
+            json.dumps(result, ensure_ascii=False), encoding="utf-8"
+        )
+    except (OSError, TypeError) as e:
+        print(f"Could not cache result: {e}")
+        return
+    _prune_content_results()
+
+def _prune_content_results():
+    """Drop expired entries and the least recently used ones beyond the size limit"""
+    entries = []
+    for entry in CONTENT_RESULT_CACHE_DIR.glob("*.json"):
+        try:
+            entries.append((entry.stat().st_mtime, entry))
+        except OSError:
+            continue
+    entries.sort(reverse=True)
+    cutoff = time.time() - CONTENT_RESULT_CACHE_MAX_AGE_SECONDS
+    for index, (mtime, entry) in enumerate(entries):
+        if index >= CONTENT_RESULT_CACHE_MAX_ENTRIES or mtime < cutoff:
+            try:
+                entry.unlink()
+            except OSError:
+                pass
+
+def _result_cache_key(file_path):
+    """Cache key for a file's current version (None if it can't be read)"""
+    import hashlib
+    version = _file_version(file_path)
+    if version is None:
+        return None
+    path, mtime, size = version
+    return hashlib.sha1(f"{path}:{mtime}:{size}".encode("utf-8")).hexdigest()
+
+def load_cached_result(file_path):
+    """Return the cached result for this exact file version, or None"""
+    key = _result_cache_key(file_path)
+    if key is None:
+        return None
+    try:
+        cached = json.loads(LAST_RESULT_CACHE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return cached.get("result") if cached.get("key") == key else None
+
+def is_model_result(result):
+    """True for a real model summary - not file info or the 'AI summary unavailable' placeholder"""
+    return bool(result.get("backend_used")) and not result.get("summary_fallback")
+
+def save_cached_result(file_path, result):
+    """Store a backend result as the last-session result (model summaries only)"""
+    if not is_model_result(result):
+        return
+    key = _result_cache_key(file_path)
+    if key is None:
+        return
+    try:
+        LAST_RESULT_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        LAST_RESULT_CACHE.write_text(json.dumps({"key": key, "result": result}), encoding="utf-8")
+    except (OSError, TypeError) as e:
+        print(f"Could not cache result: {e}")
+
+def _wait_for_ollama(timeout=OLLAMA_READY_TIMEOUT_SECONDS, interval=0.05):
+    """Poll /api/tags until Ollama answers, for a daemon that is still starting up"""
+    deadline = time.monotonic() + timeout
+    while True:
+        if _ollama_alive():
+            return True
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(interval)
+
+def initialize_backend():
+    """Initialize the backend once for fast response times"""
+    global backend_container
+    if backend_container is None:
+        try:
+            print("Initializing backend...")
+            # Check if we're running from executable
+            if getattr(sys, 'frozen', False):
+                print("Running from executable - adjusting paths...")
+                # We're running from PyInstaller bundle
+                bundle_dir = sys._MEIPASS
+                sys.path.insert(0, bundle_dir)
+                print(f"Bundle directory: {bundle_dir}")
+            
+            # Check if Ollama is running - one HTTP round-trip instead of spawning the CLI.
+            # The probe runs while the bootstrap (and the service graph) is imported.
+            ollama_status = {"alive": False}
+            ollama_probe = threading.Thread(
+                target=lambda: ollama_status.update(alive=_wait_for_ollama()),
+                name="ollama-probe", daemon=True
+            )
+            ollama_probe.start()
+            
+            # Initialize bootstrap with error handling
+            try:
+                from src.bootstrap import get_bootstrap
+                bootstrap = get_bootstrap()
+                print("Bootstrap loaded")
+            except ImportError as e:
+                print(f"Bootstrap import failed: {e}")
+                # Try alternative import for executable
+                try:
+                    import bootstrap
+                    bootstrap = bootstrap.get_bootstrap()
+                    print("Bootstrap loaded (alternative path)")
+                except Exception as e2:
+                    raise Exception(f"Could not import bootstrap: {e}, {e2}")
+            
+            ollama_probe.join()
+            if not ollama_status["alive"]:
+                import shutil
+                if shutil.which("ollama") is None:
+                    raise Exception("Ollama not found in PATH")
+                raise Exception("Ollama check failed: service not running")
+            print("Ollama service verified")
+            
+            # Perform health check
+            try:
+                if not bootstrap.health_check():
+                    raise Exception("Backend health check failed")
+                print("Health check passed")
+            except Exception as e:
+                raise Exception(f"Health check error: {e}")
+            
+            # Build the content processor singleton now, not when the first file arrives
+            bootstrap.get_content_processor()
+            
+            # health_check loaded the model list, which starts preloading the
+            # summary models into Ollama memory in the background
+            backend_container = bootstrap
+            print("Backend initialized and ready (model preload running)")
+            
+        except ImportError as e:
+            error_msg = f"Backend import failed: {e}"
+            print(f"{error_msg}")
+            print("Running in standalone mode without AI processing")
+            backend_container = None
+        except Exception as e:
+            error_msg = f"Backend initialization failed: {e}"
+            print(f"{error_msg}")
+            print("Make sure Ollama service is running: ollama serve")
+            print("Try running the Python version: python src\\ui\\main.py <file>")
+            backend_container = None
+    backend_ready.set()
+    return backend_container
+
+def start_backend_initialization():
+    """Run initialize_backend on a background thread (first call only)"""
+    global _backend_init_thread
+    with _backend_init_lock:
+        if _backend_init_thread is None:
+            _backend_init_thread = threading.Thread(target=initialize_backend, name="backend-init", daemon=True)
+            _backend_init_thread.start()
+
+def _file_version(file_path):
+    """(path, mtime, size) of the file's current version, None if it can't be read"""
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return (os.path.abspath(file_path), stat.st_mtime, stat.st_size)
+
+def process_file_with_backend(file_path, use_cache=True):
+    """
+    Process file using the initialized backend
+    
+    Args:
+        file_path: File to summarize
+        use_cache: Return a stored result when there is one; False always asks the model
+        
+    Returns:
+        Display data for the file
+    """
+    try:
+        start_backend_initialization()
+        if not backend_ready.wait(timeout=BACKEND_READY_TIMEOUT_SECONDS):
+            raise Exception("Backend initialization timed out")
+        bootstrap = backend_container
+        if not bootstrap:
+            raise Exception("Backend not available")
+        
+        # Keyed by file bytes and the current models/prompts, so a model or prompt change misses
+        content_key = _content_cache_key(file_path, bootstrap.get_ollama_service())
+        if use_cache and content_key is not None:
+            cached = _load_content_result(content_key)
+            if cached is not None:
+                print(f"Using cached result for identical content: {file_path}")
+                # Same bytes may live under another name
+                cached["file_path"] = file_path
+                cached["extension"] = Path(file_path).suffix
+                return cached
+        
+        print(f"Processing file with backend: {file_path}")
+        
+        # Get content processor from bootstrap
+        content_processor = bootstrap.get_content_processor()
+        
+        # Process file and get structured results
+        result = content_processor.process_file(file_path)
+        
+        if not result.get('success', False):
+            raise Exception(result.get('error', 'Processing failed'))
+        
+        # Extract structured summary data
+        structured_summary = result.get('structured_summary', {})
+        content = result.get('content', '')
+        
+        # Handle both old and new format for compatibility
+        if structured_summary:
+            tldr = structured_summary.get('tldr', '').strip()
+            bullets = structured_summary.get('bullets', [])
+            paragraph = structured_summary.get('paragraph', '').strip()
+            sources = structured_summary.get('sources', {})
+            
+            # Clean bullets to prevent text cutting
+            if isinstance(bullets, list):
+                bullets = [bullet.strip() for bullet in bullets if bullet and bullet.strip()]
+        else:
+            # Fallback to old format
+            summary = result.get('summary', '')
+            sentences = summary.split('. ')[:3]
+            tldr = summary[:200] + "..." if len(summary) > 200 else summary
+            bullets = [sentence.strip() + '.' for sentence in sentences if sentence.strip()]
+            paragraph = summary
+            sources = {'tldr': '', 'bullets': [], 'paragraph': []}
+        
+        data = {
+            "file_path": file_path,
+            "extension": Path(file_path).suffix,
+            "summaries": {
+                "tldr": tldr,
+                "bullets": bullets,
+                "paragraph": paragraph,
+                "sources": sources
+            },
+            "file_content": content[:2000] + "..." if len(content) > 2000 else content,
+            "backend_used": True,
+            "processing_time": result.get('metadata', {}).get('processing_time', 0)
+        }
+        if structured_summary.get('fallback'):
+            # The model could not be reached - show the placeholder but never cache it
+            data["summary_fallback"] = True
+            return data
+        if content_key is not None:
+            _save_content_result(content_key, data)
+        return data
+        
+    except Exception as e:
+        print(f"Backend processing failed: {e}")
+        # Fallback to file info display
+        return get_file_info_fallback(file_path, str(e))
+
+def get_file_info_fallback(file_path, error_message=""):
+    """Enhanced fallback with fast processing for immediate feedback"""
+    if not file_path:
+        return DUMMY_DATA
+    try:
+        stat_result = os.stat(file_path)
+    except OSError:
+        return DUMMY_DATA
+    
+    path = Path(file_path)
+    path_str = str(path)
+    abs_path = str(path.absolute())
+    name = path.name
+    suffix = path.suffix
+    type_label = suffix.upper()
+    
+    try:
+        # Use fast processor for immediate results
+        from src.utils.fast_processor import fast_file_validation, fast_read_preview, classify_file, create_quick_summary
+        
+        # Quick validation
+        validation = fast_file_validation(path_str, stat_result)
+        if not validation.get("valid", False):
+            return create_error_fallback(path_str, validation.get("error", "Unknown error"))
+        
+        file_size = validation["size"]
+        size_mb = file_size / (1024 * 1024)
+        
+        kind = classify_file(path_str)
+        
+        # Bounded read for text files - only a preview is shown, never the whole file
+        if kind == "text":
+            content, truncated = fast_read_preview(path_str)
+            quick_summary = create_quick_summary(content, path_str, file_size, partial=truncated)
+            
+            return {
+                "file_path": abs_path,
+                "extension": suffix,
+                "summaries": quick_summary,
+                "file_content": content[:2000] + "..." if len(content) > 2000 else content,
+                "backend_used": False,
+                "processing_time": 0.1  # Very fast
+            }
+        elif kind in ("audio", "video"):
+            # Audio and video files - show informational summary
+            quick_summary = create_quick_summary("", path_str, file_size)
+            media_type = kind
+            
+            return {
+                "file_path": abs_path,
+                "extension": suffix,
+                "summaries": quick_summary,
+                "file_content": f"{media_type.title()} file: {name}\nSize: {size_mb:.2f} MB\nType: {type_label}\n\nTo view transcribed content, ensure the AI backend is running and try again. The system will automatically extract speech content and provide ADHD-friendly summaries.",
+                "backend_used": False,
+                "processing_time": 0.05
+            }
+        else:
+            # Non-text file
+            return {
+                "file_path": abs_path,
+                "extension": suffix,
+                "summaries": {
+                    "tldr": f"Binary file '{name}' ({size_mb:.2f} MB)",
+                    "bullets": [
+                        f"📁 File: {name}",
+                        f"📊 Size: {size_mb:.2f} MB ({file_size:,} bytes)",
+                        f"📄 Type: {type_label} file",
+                        "ℹ️ Binary file - content preview not available"
+                    ],
+                    "paragraph": f"This is a binary file named '{name}' with a size of {size_mb:.2f} MB. The file type is {type_label}. For AI-powered analysis of this file type, ensure the backend services are running and the file type is supported."
+                },
+                "file_content": f"Binary file: {name}\nSize: {size_mb:.2f} MB\nType: {type_label}\n\nContent preview not available for binary files.",
+                "backend_used": False,
+                "processing_time": 0.05
+            }
+    except Exception as e:
+        return create_error_fallback(path_str, str(e))
+
+def create_error_fallback(file_path: str, error: str) -> Dict[str, Any]:
+    """Create error fallback result"""
+    return {
+        "file_path": file_path,
+        "extension": ".txt",
+        "summaries": {
+            "tldr": f"Could not process file: {error[:100]}",
+            "bullets": [
+                "❌ File processing failed",
+                f"Error: {error[:50]}...",
+                "Try using the Python version directly"
+            ],
+            "paragraph": f"An error occurred while trying to process the file: {error}"
+        },
+        "file_content": f"Error reading file: {error}",
+        "backend_used": False,
+        "processing_time": 0
+    }
+
+# Loading messages that cycle on the loading page
+LOADING_MESSAGES = (
+    "🔍 Analyzing content...",
+    "🧠 Generating neurodivergent-friendly summary...",
+    "📝 Creating key points...",
+    "✨ Almost ready..."
+)
+
+def create_loading_page(page: "ft.Page", file_name: str = None) -> "ft.Container":
+    """Create an animated loading page"""
+    import asyncio
+    import itertools
+    import flet as ft
+    
+    file_text = f"Processing {file_name}..." if file_name else "Initializing Prism..."
+    
+    # Create progress ring
+    progress_ring = ft.ProgressRing(width=50, height=50, stroke_width=4)
+    
+    loading_text = ft.Text(
+        LOADING_MESSAGES[0],
+        size=16,
+        text_align=ft.TextAlign.CENTER,
+        italic=True
+    )
+    
+    # Create loading container
+    loading_container = ft.Container(
+        content=ft.Column([
+            ft.Text(
+                file_text,
+                size=24,
+                weight="bold",
+                text_align=ft.TextAlign.CENTER,
+                color="#0D47A1"
+            ),
+            ft.Container(height=20),  # Spacer
+            progress_ring,
+            ft.Container(height=20),  # Spacer
+            loading_text,
+            ft.Container(height=20),  # Spacer
+            ft.Text(
+                "⚡ Using optimized AI processing for faster results",
+                size=12,
+                text_align=ft.TextAlign.CENTER,
+                color="#666",
+                italic=True
+            )
+        ],
+        horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+        spacing=10
+        ),
+        alignment=ft.alignment.center,
+        expand=True,
+        padding=50
+    )
+    
+    # Cycle the loading message every 2 seconds on Flet's event loop
+    async def loading_animation():
+        for message in itertools.islice(itertools.cycle(LOADING_MESSAGES), 1, None):
+            await asyncio.sleep(2)
+            if loading_container not in page.controls:
+                break
+            loading_text.value = message
+            loading_text.update()
+    
+    # Task handle kept on the container so the caller can cancel it
+    loading_container.data = page.run_task(loading_animation)
+    
+    return loading_container
+
+async def process_file_async(file_path: str, refresh: bool = False) -> Dict[str, Any]:
+    """
+    Process a file without blocking the event loop
+    
+    Concurrent calls for the same file await one shared run.
+    
+    Args:
+        file_path: File to summarize
+        refresh: Skip stored results and ask the model again
+    """
+    import asyncio
+    key = (os.path.abspath(file_path), refresh)
+    task = _in_flight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_process_file(file_path, refresh))
+        _in_flight[key] = task
+        task.add_done_callback(lambda _: _in_flight.pop(key, None))
+    else:
+        print(f"⏳ Waiting for in-flight processing of: {file_path}")
+    # Shielded so one cancelled caller doesn't cancel the run for the others
+    return await asyncio.shield(task)
+
+async def _process_file(file_path: str, refresh: bool = False) -> Dict[str, Any]:
+    """Run the blocking backend pipeline on a worker thread"""
+    import asyncio
+    print(f"🚀 Starting async processing for: {file_path}")
+    start_time = time.time()
+    
+    # Process the file - waiting for a slot yields to the event loop, the UI stays live
+    global _backend_semaphore
+    if _backend_semaphore is None:
+        _backend_semaphore = asyncio.Semaphore(BACKEND_CONCURRENCY)
+    async with _backend_semaphore:
+        result = await asyncio.to_thread(process_file_with_backend, file_path, not refresh)
+    
+    processing_time = time.time() - start_time
+    result['actual_processing_time'] = processing_time
+    
+    if is_model_result(result):
+        await asyncio.to_thread(save_cached_result, file_path, result)
+    
+    return result
+
+# Theme-dependent colors used by build_content_ui
+LIGHT_COLORS = {
+    "card_bg": "#FFFFFF",
+    "card_border": "#E0E0E0",
+    "header_text": "#1976D2",
+    "status_fallback": "#FF9800",
+    "label": "#666666",
+    "value": "#2E2E2E",
+    "info_bg": "#F8F9FA",
+    "summary_text": "#2E2E2E",
+    "bullet_avatar": "#1976D2",
+    "content_bg": "#F8F9FA",
+    "content_text": "#2E2E2E",
+}
+DARK_COLORS = {
+    "card_bg": "#23272F",
+    "card_border": "#444851",
+    "header_text": "#FFB74D",
+    "status_fallback": "#FFD54F",
+    "label": "#BDBDBD",
+    "value": "#F5F5F5",
+    "info_bg": "#383838",
+    "summary_text": "#FFECB3",
+    "bullet_avatar": "#FFB300",
+    "content_bg": "#181A20",
+    "content_text": "#F5F5F5",
+}
+
+DUMMY_DATA = {
+    "file_path": "C:/Users/aryah/Documents/sample_document.pdf",
+    "extension": ".pdf",
+    "summaries": {
+        "tldr": "Quickly explains the core ideas behind attention strategies.",
+        "bullets": [
+            "Defines ADHD in simple terms",
+            "Lists common behavioral patterns",
+            "Shares techniques for improved focus"
+        ],
+        "paragraph": "The document gives a concise yet informative overview of Attention Deficit Hyperactivity Disorder (ADHD). "
+            "It highlights symptoms, diagnosis methods, and behavioral therapy options for individuals, especially children. "
+            "The emphasis is on early detection and practical coping mechanisms to manage attention-related challenges effectively."
+    },
+    "file_content": (
+        "ADHD stands for Attention Deficit Hyperactivity Disorder. It is a neurological disorder that affects a person’s "
+        "ability to focus, control impulses, and maintain attention. Children and adults with ADHD often struggle with "
+        "organization and time management. This guide walks through essential ADHD symptoms, diagnosis procedures, and coping "
+        "strategies such as creating structured environments, using reminders, and building positive routines."
+    )
+}
+
+async def main(page: "ft.Page"):
+    import flet as ft
+    
+    # Import TTS functionality with fallback for direct execution
+    try:
+        from .tts_manager import tts_manager
+        from .tts_components import create_tts_controls_panel, create_tts_unavailable_panel
+    except ImportError:
+        # Fallback for direct script execution
+        from tts_manager import tts_manager
+        from tts_components import create_tts_controls_panel, create_tts_unavailable_panel
+    
+    page.title = "Prism"
+    page.scroll = "auto"
+    page.window_width = 900
+    page.window_height = 800
+    page.fonts = {"lexend": "https://fonts.googleapis.com/css2?family=Lexend&display=swap"}
+    page.theme_mode = ft.ThemeMode.LIGHT
+    page.padding = 20
+    page.bgcolor = "#FAFAFA"
+
+    # Get file path from command line arguments (from context menu)
+    file_path = None
+    if len(sys.argv) > 1:
+        file_path = sys.argv[1]
+        print(f"File received from context menu: {file_path}")
+    else:
+        print("No file provided - using demo data")
+
+    # Initialize backend in the background (non-blocking, usually already started in __main__)
+    print("Starting backend initialization...")
+    start_backend_initialization()
+
+    # State variables for async processing
+    content_data = {"value": None}
+    is_loading = {"value": True}
+    summaries_controls = []  # Store summary controls for font size updates
+    font_update_timer = {"value": None}  # Pending debounced font size update
+    themed_controls = []  # (control, {attribute: color key}) recolored on theme switch
+    displayed_data = {"value": None}  # Data behind the content currently on the page
+    
+    # Create loading page initially
+    file_name = Path(file_path).name if file_path else None
+    loading_container = create_loading_page(page, file_name)
+    
+    # Font size and theme settings
+    font_size_slider = ft.Slider(
+        min=12, 
+        max=24, 
+        divisions=6, 
+        label="{value}px", 
+        value=16,
+        active_color="#1976D2",
+        thumb_color="#1976D2"
+    )
+    
+    theme_switch = ft.Switch(
+        label="Dark Mode",
+        active_color="#1976D2"
+    )
+
+    paragraph_visible = ft.Ref[ft.Text]()
+    toggle_btn = ft.Ref[ft.ElevatedButton]()
+    tts_container_ref = ft.Ref[ft.Container]()
+
+    def toggle_paragraph(e):
+        if paragraph_visible.current:
+            # Toggle visibility of the paragraph container
+            is_visible = not paragraph_visible.current.visible
+            paragraph_visible.current.visible = is_visible
+            
+            # Also toggle TTS controls visibility
+            if tts_container_ref.current:
+                tts_container_ref.current.visible = is_visible
+            
+            if toggle_btn.current:
+                if is_visible:
+                    toggle_btn.current.text = "Hide Full Summary"
+                    toggle_btn.current.icon = ft.Icons.EXPAND_LESS
+                else:
+                    toggle_btn.current.text = "Show Full Summary"
+                    toggle_btn.current.icon = ft.Icons.EXPAND_MORE
+            page.update()
+
+    def change_theme(e):
+        page.theme_mode = ft.ThemeMode.DARK if theme_switch.value else ft.ThemeMode.LIGHT
+        page.bgcolor = "#1E1E1E" if theme_switch.value else "#FAFAFA"
+        # Recolor the existing controls instead of rebuilding the content
+        colors = LIGHT_COLORS if page.theme_mode == ft.ThemeMode.LIGHT else DARK_COLORS
+        for control, color_keys in themed_controls:
+            for attr, key in color_keys.items():
+                setattr(control, attr, ft.border.all(1, colors[key]) if attr == "border" else colors[key])
+        # The TTS panel takes the theme at construction
+        if tts_container_ref.current and displayed_data["value"]:
+            tts_container_ref.current.content = create_tts_panel(displayed_data["value"])
+        page.update()
+
+    def themed(control, **color_keys):
+        """Register control attributes (attribute=color key) that follow the theme"""
+        themed_controls.append((control, color_keys))
+        return control
+
+    def apply_font_size():
+        font_update_timer["value"] = None
+        for ctrl in summaries_controls:
+            ctrl.size = font_size_slider.value
+        # Only the summary texts changed - don't diff the whole page
+        page.update(*summaries_controls)
+
+    def update_font_size(e):
+        # Coalesce slider ticks while dragging into one update per debounce window
+        if font_update_timer["value"] is None:
+            timer = threading.Timer(FONT_SIZE_DEBOUNCE_SECONDS, apply_font_size)
+            timer.daemon = True
+            font_update_timer["value"] = timer
+            timer.start()
+
+    def create_card(content, colors, padding=20):
+        """Create a Streamlit-like card container"""
+        return themed(ft.Container(
+            content=content,
+            padding=padding,
+            margin=ft.margin.only(bottom=20),
+            bgcolor=colors["card_bg"],
+            border_radius=12,
+            shadow=ft.BoxShadow(
+                spread_radius=0,
+                blur_radius=8,
+                color=ft.Colors.with_opacity(0.1, "#000000"),
+                offset=ft.Offset(0, 2),
+            ),
+            border=ft.border.all(1, colors["card_border"])
+        ), bgcolor="card_bg", border="card_border")
+
+    def create_tts_panel(data):
+        """Create the TTS controls for the current theme"""
+        return create_tts_controls_panel(
+            data=data,
+            paragraph_visible=paragraph_visible,
+            page=page,
+            theme_mode=page.theme_mode
+        ) if tts_manager.is_available else create_tts_unavailable_panel(page.theme_mode)
+
+    def create_section_header(text, icon=""):
+        """Create a consistent section header"""
+        return ft.Row([
+            ft.Text(
+                f"{icon} {text}",
+                size=22,
+                weight="bold",
+                font_family="lexend",
+                color="#1976D2"
+            )
+        ], alignment=ft.MainAxisAlignment.START)
+
+    def build_content_ui(data):
+        """Build the main content UI with processed data"""
+        page.controls.clear()  # Clear loading screen
+        themed_controls.clear()
+        displayed_data["value"] = data
+        colors = LIGHT_COLORS if page.theme_mode == ft.ThemeMode.LIGHT else DARK_COLORS
+        backend_used = data.get("backend_used", False)
+        
+        # Main container for all content
+        main_container = ft.Column(
+            controls=[],
+            spacing=0,
+            expand=True
+        )
+        
+        # Header section
+        welcome_text = "Prism"
+        if file_path:
+            file_name = Path(file_path).name
+            welcome_text = f"Prism\n{file_name}"
+        
+        header_text_color = colors["header_text"]
+        status_color = "#4CAF50" if backend_used else colors["status_fallback"]
+        status_controls = [
+            ft.Icon(
+                ft.Icons.SMART_TOY if backend_used else ft.Icons.DASHBOARD,
+                color=status_color,
+                size=20
+            ),
+            ft.Text(
+                f"Processed with AI Backend ({data.get('actual_processing_time', 0):.1f}s)" 
+                if backend_used 
+                else "Demo Mode / Backend Unavailable",
+                size=14,
+                color=status_color,
+                font_family="lexend"
+            )
+        ]
+        if not backend_used:
+            for control in status_controls:
+                themed(control, color="status_fallback")
+        header_card = create_card(
+            ft.Column([
+                themed(ft.Text(
+                    welcome_text,
+                    size=36,
+                    weight="bold",
+                    font_family="lexend",
+                    color=header_text_color,
+                    text_align=ft.TextAlign.CENTER
+                ), color="header_text"),
+                ft.Container(height=10),
+                # Enhanced status indicator
+                ft.Row(status_controls, alignment=ft.MainAxisAlignment.CENTER)
+            ], horizontal_alignment=ft.CrossAxisAlignment.CENTER),
+            colors,
+            padding=30
+        )
+        main_container.controls.append(header_card)
+
+        # Settings card
+        settings_card = create_card(
+            ft.Column([
+                create_section_header("Settings", "⚙️"),
+                ft.Container(height=15),
+                ft.Row([
+                    ft.Container(
+                        ft.Row([
+                            ft.Text("Font Size:", font_family="lexend", weight="w500"),
+                            ft.Container(width=10),
+                            ft.Container(
+                                font_size_slider,
+                                expand=True
+                            )
+                        ]),
+                        expand=True
+                    ),
+                    ft.Container(width=30),
+                    theme_switch
+                ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN)
+            ]),
+            colors
+        )
+        main_container.controls.append(settings_card)
+        
+        # File info card
+        label_color = colors["label"]
+        value_color = colors["value"]
+        file_info_card = create_card(
+            ft.Column([
+                create_section_header("File Information", "📄"),
+                ft.Container(height=15),
+                themed(ft.Container(
+                    ft.Column([
+                        ft.Row([
+                            themed(ft.Text("File:", weight="bold", font_family="lexend", color=label_color), color="label"),
+                            themed(ft.Text(Path(data["file_path"]).name, font_family="lexend", color=value_color), color="value")
+                        ]),
+                        ft.Row([
+                            themed(ft.Text("Type:", weight="bold", font_family="lexend", color=label_color), color="label"),
+                            themed(ft.Text(data["extension"].upper(), font_family="lexend", color=value_color), color="value")
+                        ]),
+                        ft.Row([
+                            themed(ft.Text("AI Processed:", weight="bold", font_family="lexend", color=label_color), color="label"),
+                            themed(ft.Text("Yes" if backend_used else "No", font_family="lexend", color=value_color), color="value")
+                        ])
+                    ], spacing=8),
+                    padding=15,
+                    bgcolor=colors["info_bg"],
+                    border_radius=8
+                ), bgcolor="info_bg")
+            ]),
+            colors
+        )
+        main_container.controls.append(file_info_card)
+
+        # Clear summaries controls for new content
+        summaries_controls.clear()
+
+        # TL;DR card with source reference
+        tldr_text = themed(ft.Text(
+            data["summaries"]["tldr"],
+            font_family="lexend",
+            size=font_size_slider.value,
+            color=colors["summary_text"]
+        ), color="summary_text")
+        
+        tldr_container = ft.Column([
+            create_section_header("TL;DR", "📌"),
+            ft.Container(height=15),
+            tldr_text
+        ])
+        
+        # Add source reference if available
+        if "sources" in data["summaries"] and data["summaries"]["sources"].get("tldr"):
+            source_ref = ft.Text(
+                f"Source: {data['summaries']['sources']['tldr']}",
+                font_family="lexend",
+                size=12,
+                italic=True,
+                color="#1976D2"
+            )
+            tldr_container.controls.append(ft.Container(height=8))
+            tldr_container.controls.append(source_ref)
+        
+        tldr_card = create_card(tldr_container, colors)
+        main_container.controls.append(tldr_card)
+        summaries_controls.append(tldr_text)
+
+        # Key points card with source references
+        bullet_avatar_bg = colors["bullet_avatar"]
+        bullet_text_color = colors["summary_text"]
+        bullet_sources = data["summaries"].get("sources", {}).get("bullets")
+        if not isinstance(bullet_sources, list):
+            bullet_sources = []
+
+        def make_bullet(i, point, source_ref):
+            """Build one numbered key point, returning (bullet control, its text control)"""
+            point_text = themed(ft.Text(
+                point,
+                font_family="lexend",
+                size=font_size_slider.value,
+                expand=True,
+                color=bullet_text_color
+            ), color="summary_text")
+            bullet_content = ft.Column([
+                ft.Row([
+                    ft.Container(
+                        themed(ft.CircleAvatar(
+                            content=ft.Text(str(i), size=12, weight="bold", color="#FFFFFF"),
+                            bgcolor=bullet_avatar_bg,
+                            radius=12
+                        ), bgcolor="bullet_avatar")
+                    ),
+                    ft.Container(width=10),
+                    point_text
+                ])
+            ])
+            
+            # Add source reference if available
+            if source_ref:
+                bullet_content.controls.append(
+                    ft.Container(
+                        content=ft.Text(
+                            f"Source: {source_ref}",
+                            font_family="lexend",
+                            size=11,
+                            italic=True,
+                            color="#1976D2"
+                        ),
+                        margin=ft.margin.only(left=34, top=2)
+                    )
+                )
+            return bullet_content, point_text
+
+        bullets = [
+            make_bullet(i, point, bullet_sources[i - 1] if i <= len(bullet_sources) else None)
+            for i, point in enumerate(data["summaries"]["bullets"], 1)
+        ]
+        bullet_column = ft.Column([bullet for bullet, _ in bullets], spacing=12)
+        summaries_controls.extend(text for _, text in bullets)
+
+        key_points_card = create_card(
+            ft.Column([
+                create_section_header("Key Points", "🔹"),
+                ft.Container(height=15),
+                bullet_column
+            ]),
+            colors
+        )
+        main_container.controls.append(key_points_card)
+
+        # Full summary card (collapsible) with TTS controls positioned to the right
+        # Create full summary text with source references
+        paragraph = themed(ft.Text(
+            data["summaries"]["paragraph"],
+            font_family="lexend",
+            size=font_size_slider.value,
+            visible=False,
+            ref=paragraph_visible,
+            color=colors["summary_text"]
+        ), color="summary_text")
+        summary_container = ft.Column([paragraph])
+
+        # Add source references if available
+        if "sources" in data["summaries"] and data["summaries"]["sources"].get("paragraph"):
+            sources = data["summaries"]["sources"]["paragraph"]
+            if isinstance(sources, (list, str)):
+                source_text = (
+                    f"Sources: {sources}" if isinstance(sources, str)
+                    else f"Sources: {', '.join(sources)}"
+                )
+                source_ref = ft.Container(
+                    content=ft.Text(
+                        source_text,
+                        font_family="lexend",
+                        size=12,
+                        italic=True,
+                        color="#1976D2",
+                        visible=False  # Initially hidden like the paragraph
+                    ),
+                    margin=ft.margin.only(top=10)
+                )
+                summary_container.controls.append(source_ref)
+        
+        paragraph_text = summary_container
+        
+        toggle_button = ft.ElevatedButton(
+            "Show Full Summary",
+            ref=toggle_btn,
+            on_click=toggle_paragraph,
+            style=ft.ButtonStyle(
+                bgcolor="#1976D2",
+                color="#FFFFFF",
+                shape=ft.RoundedRectangleBorder(radius=8)
+            ),
+            icon=ft.Icons.EXPAND_MORE
+        )
+        
+        # Create TTS controls using the separate component
+        tts_controls = create_tts_panel(data)
+        
+        # Full summary content with TTS positioned to the right when expanded
+        full_summary_content = ft.Column([
+            create_section_header("Full Summary", "📋"),
+            ft.Container(height=15),
+            
+            # Toggle button row
+            ft.Row([
+                toggle_button,
+            ], alignment=ft.MainAxisAlignment.START),
+            
+            ft.Container(height=10),
+            
+            # Content and TTS side by side when expanded
+            ft.Row([
+                # Left side: paragraph text
+                ft.Container(
+                    content=paragraph_text,
+                    expand=True,
+                    padding=ft.padding.only(right=20)
+                ),
+                # Right side: TTS controls (only visible when paragraph is visible)
+                ft.Container(
+                    content=tts_controls,
+                    visible=False,  # Will be controlled by toggle
+                    ref=tts_container_ref
+                )
+            ], alignment=ft.MainAxisAlignment.START, vertical_alignment=ft.CrossAxisAlignment.START)
+        ])
+        
+        full_summary_card = create_card(full_summary_content, colors)
+        main_container.controls.append(full_summary_card)
+        summaries_controls.append(paragraph)
+
+        # File content card
+        file_content_bg = colors["content_bg"]
+        file_content_text = colors["content_text"]
+        content_card = create_card(
+            ft.Column([
+                create_section_header("File Content", "📘"),
+                ft.Container(height=15),
+                themed(ft.Container(
+                    themed(ft.Text(
+                        data["file_content"],
+                        font_family="Consolas",
+                        size=14,
+                        selectable=True,
+                        color=file_content_text
+                    ), color="content_text"),
+                    padding=20,
+                    bgcolor=file_content_bg,
+                    border_radius=8,
+                    border=ft.border.all(1, colors["card_border"])
+                ), bgcolor="content_bg", border="card_border")
+            ]),
+            colors
+        )
+        main_container.controls.append(content_card)
+        
+        # Set up event handlers
+        theme_switch.on_change = change_theme
+        font_size_slider.on_change = update_font_size
+        
+        # page.add sends the cleared page and the new column in one update
+        page.add(main_container)
+
+    def on_processing_complete(result, error):
+        """Callback when async processing completes"""
+        if loading_container.data:
+            loading_container.data.cancel()
+        cached = content_data["value"]
+        if cached is not None and (error or not is_model_result(result)
+                                   or result["summaries"] == cached["summaries"]):
+            # The cached result on screen is still current (or better than a fallback)
+            return
+        if error:
+            # Handle error case
+            error_data = get_file_info_fallback(file_path, error)
+            build_content_ui(error_data)
+        else:
+            # Handle success case
+            content_data["value"] = result
+            is_loading["value"] = False
+            build_content_ui(result)
+
+    # Show the last result for this file right away, otherwise the loading screen
+    cached_result = load_cached_result(file_path) if file_path else None
+    if cached_result:
+        content_data["value"] = cached_result
+        build_content_ui(cached_result)
+    else:
+        page.add(loading_container)
+        page.update()
+
+    async def run_processing():
+        try:
+            # A painted cached result is refreshed from the model, not from the caches
+            result = await process_file_async(file_path, refresh=cached_result is not None)
+        except Exception as e:
+            print(f"❌ Async processing failed: {e}")
+            on_processing_complete(None, str(e))
+            return
+        on_processing_complete(result, None)
+
+    # Start processing
+    if file_path and os.path.exists(file_path):
+        # Process file on Flet's event loop (refreshes the cached result if shown)
+        page.run_task(run_processing)
+    else:
+        # Use demo data immediately - it needs no I/O
+        demo_data = DUMMY_DATA.copy()
+        demo_data["backend_used"] = False
+        demo_data["actual_processing_time"] = 0
+        on_processing_complete(demo_data, None)
+
+if __name__ == "__main__":
+    print("Starting Prism...")
+    if len(sys.argv) > 1:
+        # The path may not be encodable on a Windows console
+        print(f"File from context menu: {ascii(sys.argv[1])}")
+    else:
+        print("Running in demo mode")
+    
+    # Overlap backend imports, the Ollama probe and model preload with window creation
+    start_backend_initialization()
+    
+    # Plain module name - 'ft' is the type-checking alias at the top of the file
+    import flet
+    flet.app(target=main)
@@ -3,8 +3,11 @@ Text-to-Speech UI Components for Prism
 Provides TTS controls and interface elements
 """
 
+import logging
+import threading
+from dataclasses import dataclass
 import flet as ft
-from typing import Dict, Any, Callable
+from typing import Dict, Any, Callable, List, Optional, Tuple
 
 # Import TTS manager with fallback for direct execution
 try:
@@ -13,6 +16,71 @@ except ImportError:
     # Fallback for direct script execution
     from tts_manager import tts_manager
 
+logger = logging.getLogger('accessibility_assistant.tts_components')
+
+# Translucent panel colors, resolved once at import
+_BG_INFO = ft.Colors.with_opacity(0.05, "#2196F3")
+_BG_TIP = ft.Colors.with_opacity(0.05, "#1976D2")
+_BG_UNAVAILABLE = ft.Colors.with_opacity(0.05, "#999999")
+_SHADOW = ft.Colors.with_opacity(0.1, "#1976D2")
+
+# Set once the SAPI engine has passed its check this session
+_tts_probed = False
+# Set while that check runs on its worker thread; clicks are ignored meanwhile
+_tts_probing = False
+
+# (dropdown option key/text pairs, default voice key), filled on first panel build
+_VOICE_CACHE: Optional[Tuple[List[Tuple[str, str]], str]] = None
+
+
+@dataclass
+class TTSPanelState:
+    """Controls and playback state of one TTS controls panel"""
+    play_btn: Optional[ft.IconButton] = None
+    restart_btn: Optional[ft.IconButton] = None
+    status: Optional[ft.Text] = None
+    voice_dropdown: Optional[ft.Dropdown] = None
+    rate_slider: Optional[ft.Slider] = None
+    volume_slider: Optional[ft.Slider] = None
+    is_speaking: bool = False
+    is_paused: bool = False
+    current_voice: int = 0
+    rate: int = 0
+    volume: int = 80
+
+
+def _build_voice_cache() -> Tuple[List[Tuple[str, str]], str]:
+    """
+    Enumerate SAPI voices once for the voice dropdown
+    
+    Returns:
+        Tuple of (option key/text pairs, default voice key)
+    """
+    # Get available voices for dropdown with enhanced gender/quality information
+    voices = tts_manager.get_available_voices() if tts_manager.is_available else []
+    options = [(str(voice['id']), voice['display_name']) for voice in voices]
+    if not options:
+        options = [("0", "🌟 👩 Default Voice (Female recommended)")]
+    
+    # Find best default voice: Zira first, then any female recommended voice, then any recommended voice
+    best_id, best_score = 0, -1
+    for voice in voices:
+        if 'zira' in voice.get('name', '').lower():
+            score = 4
+        elif voice.get('is_female', False) and voice.get('recommended', False):
+            score = 2
+        elif voice.get('recommended', False):
+            score = 1
+        else:
+            score = 0
+        
+        if score > best_score:
+            best_id, best_score = voice['id'], score
+            if score == 4:
+                break
+    
+    return options, str(best_id)
+
 
 def create_tts_controls_panel(
     data: Dict[str, Any], 
@@ -21,54 +89,73 @@ def create_tts_controls_panel(
     theme_mode: ft.ThemeMode
 ) -> ft.Container:
     """Create the TTS controls panel"""
+    global _VOICE_CACHE
     
-    # TTS State variables
-    tts_state = {
-        "is_speaking": False,
-        "is_paused": False,
-        "current_voice": 0,
-        "rate": 0,
-        "volume": 80
-    }
+    # Panel controls are created below, before any handler can run
+    st = TTSPanelState()
     
-    # TTS Controls References
-    play_pause_button = ft.Ref[ft.IconButton]()
-    restart_button = ft.Ref[ft.IconButton]()
-    tts_status = ft.Ref[ft.Text]()
-    voice_dropdown = ft.Ref[ft.Dropdown]()
-    rate_slider = ft.Ref[ft.Slider]()
-    volume_slider = ft.Ref[ft.Slider]()
-    
-    def update_tts_status(status_text: str, color: str = "#666666"):
-        """Update TTS status text and color"""
-        if tts_status.current:
-            tts_status.current.value = status_text
-            tts_status.current.color = color
+    def update_tts_status(status_text: str, color: str = "#666666", flush: bool = True):
+        """
+        Update TTS status text and color
+
+        Args:
+            status_text: Status message to show
+            color: Status text color
+            flush: Push the change to the page now; pass False when the caller
+                updates the page itself at the end of the handler
+        """
+        st.status.value = status_text
+        st.status.color = color
+        if flush:
             page.update()
     
     def on_speech_complete(success: bool):
         """Callback when speech completes"""
-        tts_state["is_speaking"] = False
-        tts_state["is_paused"] = False
+        st.is_speaking = False
+        st.is_paused = False
         
         try:
-            if play_pause_button.current:
-                play_pause_button.current.icon = ft.Icons.PLAY_ARROW
-                play_pause_button.current.tooltip = "Play speech"
-            if restart_button.current:
-                restart_button.current.disabled = False
+            st.play_btn.icon = ft.Icons.PLAY_ARROW
+            st.play_btn.tooltip = "Play speech"
+            st.restart_btn.disabled = False
             
             if success:
-                update_tts_status("✅ Speech completed", "#4CAF50")
+                update_tts_status("✅ Speech completed", "#4CAF50", flush=False)
             else:
-                update_tts_status("❌ Speech failed", "#F44336")
+                update_tts_status("❌ Speech failed", "#F44336", flush=False)
             
             page.update()
         except Exception as e:
-            print(f"Error in speech complete callback: {e}")
+            logger.error(f"Error in speech complete callback: {e}")
+    
+    def probe_and_speak(text_to_speak: str):
+        """Check the TTS engine once per session, then start speaking (worker thread)"""
+        global _tts_probed, _tts_probing
+        
+        try:
+            logger.debug("Testing TTS functionality before speaking")
+            if not tts_manager.test_speech():
+                update_tts_status("🔄 Retrying TTS...", "#FF9800")
+                
+                # Try reinitializing TTS
+                if not (tts_manager.reinitialize_engine() and tts_manager.test_speech()):
+                    on_speech_complete(False)
+                    return
+            
+            _tts_probed = True
+            st.restart_btn.disabled = False
+            tts_manager.speak(text_to_speak, on_speech_complete)
+            page.update()
+        except Exception as probe_error:
+            logger.error(f"TTS check failed: {probe_error}")
+            on_speech_complete(False)
+        finally:
+            _tts_probing = False
     
     def play_pause_speech(e):
         """Handle play/pause button click with proper state synchronization"""
+        global _tts_probing
+        
         try:
             if not tts_manager.is_available:
                 update_tts_status("❌ TTS not available", "#F44336")
@@ -79,87 +166,84 @@ def create_tts_controls_panel(
                 return
             
             # Sync local state with TTS manager state
-            tts_state["is_speaking"] = tts_manager.is_speaking
-            tts_state["is_paused"] = tts_manager.is_paused
+            st.is_speaking = tts_manager.is_speaking
+            st.is_paused = tts_manager.is_paused
             
             if tts_manager.is_paused and tts_manager.is_speaking:
                 # Resume paused speech
-                print("Resume button clicked - attempting to resume speech")
+                logger.debug("Resume clicked")
                 try:
                     tts_manager.resume()
-                    tts_state["is_paused"] = False
-                    if play_pause_button.current:
-                        play_pause_button.current.icon = ft.Icons.PAUSE
-                        play_pause_button.current.tooltip = "Pause speech"
-                    if restart_button.current:
-                        restart_button.current.disabled = False
-                    update_tts_status("▶️ Speech resumed", "#4CAF50")
+                    st.is_paused = False
+                    st.play_btn.icon = ft.Icons.PAUSE
+                    st.play_btn.tooltip = "Pause speech"
+                    st.restart_btn.disabled = False
+                    update_tts_status("▶️ Speech resumed", "#4CAF50", flush=False)
                 except Exception as resume_error:
-                    print(f"Resume error: {resume_error}")
-                    update_tts_status(f"❌ Resume failed: {str(resume_error)[:30]}...", "#F44336")
+                    logger.error(f"Resume error: {resume_error}")
+                    update_tts_status(f"❌ Resume failed: {str(resume_error)[:30]}...", "#F44336", flush=False)
                     
             elif tts_manager.is_speaking and not tts_manager.is_paused:
                 # Pause current speech
-                print("Pause button clicked - attempting to pause speech")
+                logger.debug("Pause clicked")
                 try:
                     tts_manager.pause()
-                    tts_state["is_paused"] = True
-                    if play_pause_button.current:
-                        play_pause_button.current.icon = ft.Icons.PLAY_ARROW
-                        play_pause_button.current.tooltip = "Resume speech"
-                    update_tts_status("⏸️ Speech paused", "#FF9800")
+                    st.is_paused = True
+                    st.play_btn.icon = ft.Icons.PLAY_ARROW
+                    st.play_btn.tooltip = "Resume speech"
+                    update_tts_status("⏸️ Speech paused", "#FF9800", flush=False)
                 except Exception as pause_error:
-                    print(f"Pause error: {pause_error}")
-                    update_tts_status(f"❌ Pause failed: {str(pause_error)[:30]}...", "#F44336")
+                    logger.error(f"Pause error: {pause_error}")
+                    update_tts_status(f"❌ Pause failed: {str(pause_error)[:30]}...", "#F44336", flush=False)
             else:
+                if _tts_probing:
+                    logger.debug("TTS check in progress - ignoring click")
+                    return
+                
                 # Start new speech
                 text_to_speak = data["summaries"]["paragraph"]
                 if not text_to_speak.strip():
                     update_tts_status("❌ No text to speak", "#F44336")
                     return
                 
-                # Test TTS first
-                print("Testing TTS functionality before speaking...")
-                if not tts_manager.test_speech():
-                    update_tts_status("🔄 Retrying TTS...", "#FF9800")
-                    page.update()
-                    
-                    # Try reinitializing TTS
-                    if tts_manager.reinitialize_engine() and tts_manager.test_speech():
-                        update_tts_status("✅ TTS recovered", "#4CAF50")
-                    else:
-                        update_tts_status("❌ TTS failed", "#F44336")
-                        return
-                
                 # Start speaking
-                tts_state["is_speaking"] = True
-                tts_state["is_paused"] = False
+                st.is_speaking = True
+                st.is_paused = False
                 
-                if play_pause_button.current:
-                    play_pause_button.current.icon = ft.Icons.PAUSE
-                    play_pause_button.current.tooltip = "Pause speech"
-                if restart_button.current:
-                    restart_button.current.disabled = False
+                st.play_btn.icon = ft.Icons.PAUSE
+                st.play_btn.tooltip = "Pause speech"
                 
-                update_tts_status("🔊 Starting speech...", "#4CAF50")
-                print(f"Speaking text: {text_to_speak[:100]}...")
-                tts_manager.speak(text_to_speak, on_speech_complete)
+                update_tts_status("🔊 Starting speech...", "#4CAF50", flush=False)
+                logger.debug("Speaking text: %.100s", text_to_speak)
+                if _tts_probed:
+                    st.restart_btn.disabled = False
+                    tts_manager.speak(text_to_speak, on_speech_complete)
+                else:
+                    # The first engine check (and any reinit) stays off the UI thread;
+                    # Restart stays disabled until it has passed
+                    _tts_probing = True
+                    st.restart_btn.disabled = True
+                    threading.Thread(target=probe_and_speak, args=(text_to_speak,), daemon=True).start()
             
             page.update()
         except Exception as e:
-            print(f"Error in play_pause_speech: {e}")
+            logger.error(f"Error in play_pause_speech: {e}")
             update_tts_status(f"❌ Error: {str(e)[:30]}...", "#F44336")
     
     def restart_speech(e):
         """Handle restart button click - stops current speech and starts from beginning"""
         try:
+            if _tts_probing:
+                logger.debug("TTS check in progress - ignoring restart")
+                return
+            
             if tts_manager.is_available:
-                print("Restart button clicked - stopping and restarting speech")
+                logger.debug("Restart clicked")
                 
                 # Stop any current speech
                 tts_manager.stop()
-                tts_state["is_speaking"] = False
-                tts_state["is_paused"] = False
+                st.is_speaking = False
+                st.is_paused = False
                 
                 # Get text to speak
                 text_to_speak = data["summaries"]["paragraph"]
@@ -168,208 +252,189 @@ def create_tts_controls_panel(
                     return
                 
                 # Start speaking from beginning
-                tts_state["is_speaking"] = True
-                tts_state["is_paused"] = False
+                st.is_speaking = True
+                st.is_paused = False
                 
-                if play_pause_button.current:
-                    play_pause_button.current.icon = ft.Icons.PAUSE
-                    play_pause_button.current.tooltip = "Pause speech"
-                if restart_button.current:
-                    restart_button.current.disabled = False
+                st.play_btn.icon = ft.Icons.PAUSE
+                st.play_btn.tooltip = "Pause speech"
+                st.restart_btn.disabled = False
                 
-                update_tts_status("🔄 Restarting speech...", "#4CAF50")
-                print(f"Restarting speech from beginning: {text_to_speak[:100]}...")
+                update_tts_status("🔄 Restarting speech...", "#4CAF50", flush=False)
+                logger.debug("Restarting speech from beginning: %.100s", text_to_speak)
                 tts_manager.speak(text_to_speak, on_speech_complete)
                 
                 page.update()
         except Exception as e:
-            print(f"Error in restart_speech: {e}")
+            logger.error(f"Error in restart_speech: {e}")
             update_tts_status("❌ Restart error", "#F44336")
     
     def change_voice(e):
         """Handle voice selection change"""
-        if tts_manager.is_available and voice_dropdown.current:
-            voice_id = int(voice_dropdown.current.value) if voice_dropdown.current.value else 0
+        if tts_manager.is_available:
+            voice_id = int(st.voice_dropdown.value) if st.voice_dropdown.value else 0
             tts_manager.set_voice(voice_id)
-            tts_state["current_voice"] = voice_id
+            st.current_voice = voice_id
             update_tts_status(f"🎭 Voice changed", "#2196F3")
     
     def change_rate(e):
         """Handle speech rate change"""
-        if tts_manager.is_available and rate_slider.current:
-            rate = int(rate_slider.current.value)
+        if tts_manager.is_available:
+            rate = int(st.rate_slider.value)
             tts_manager.set_rate(rate)
-            tts_state["rate"] = rate
+            st.rate = rate
     
     def change_volume(e):
         """Handle volume change"""
-        if tts_manager.is_available and volume_slider.current:
-            volume = int(volume_slider.current.value)
+        if tts_manager.is_available:
+            volume = int(st.volume_slider.value)
             tts_manager.set_volume(volume)
-            tts_state["volume"] = volume
+            st.volume = volume
     
-    # Get available voices for dropdown with enhanced gender/quality information
-    voices = tts_manager.get_available_voices() if tts_manager.is_available else []
-    voice_options = [ft.dropdown.Option(str(voice['id']), voice['display_name']) for voice in voices]
-    if not voice_options:
-        voice_options = [ft.dropdown.Option("0", "🌟 👩 Default Voice (Female recommended)")]
+    # Voices are enumerated once; each panel gets its own Option controls
+    if _VOICE_CACHE is None:
+        _VOICE_CACHE = _build_voice_cache()
+    option_specs, default_voice = _VOICE_CACHE
+    voice_options = [ft.dropdown.Option(key, text) for key, text in option_specs]
     
-    # Find best default voice: Zira first, then any female recommended voice, then any recommended voice
-    default_voice = "0"
-    for voice in voices:
-        if 'zira' in voice.get('name', '').lower():
-            default_voice = str(voice['id'])
-            break
-        elif voice.get('is_female', False) and voice.get('recommended', False) and default_voice == "0":
-            default_voice = str(voice['id'])
-        elif voice.get('recommended', False) and default_voice == "0":
-            default_voice = str(voice['id'])
+    # Controls the handlers update
+    st.play_btn = ft.IconButton(
+        icon=ft.Icons.PLAY_ARROW,
+        tooltip="Play/Pause speech",
+        on_click=play_pause_speech,
+        style=ft.ButtonStyle(
+            color="#FFFFFF",
+            bgcolor="#4CAF50",
+            shape=ft.CircleBorder(),
+            padding=12
+        )
+    )
+    st.restart_btn = ft.IconButton(
+        icon=ft.Icons.RESTART_ALT,
+        tooltip="Restart from beginning",
+        on_click=restart_speech,
+        style=ft.ButtonStyle(
+            color="#FFFFFF",
+            bgcolor="#2196F3",
+            shape=ft.CircleBorder(),
+            padding=12
+        )
+    )
+    st.status = ft.Text(
+        "🔇 Ready to read aloud" if tts_manager.is_available else "❌ TTS not available",
+        size=12,
+        color="#666666",
+        text_align=ft.TextAlign.CENTER
+    )
+    st.voice_dropdown = ft.Dropdown(
+        options=voice_options,
+        value=default_voice,
+        on_change=change_voice,
+        disabled=not tts_manager.is_available,
+        text_size=12,
+        content_padding=10,
+        border_radius=8,
+        hint_text="Choose voice..."
+    )
+    st.rate_slider = ft.Slider(
+        min=-4,
+        max=2,
+        value=-2,  # Default slower speed for neurodivergent users
+        divisions=6,
+        label="Speed: {value}",
+        on_change=change_rate,
+        disabled=not tts_manager.is_available,
+        active_color="#2196F3",
+        thumb_color="#1976D2"
+    )
+    st.volume_slider = ft.Slider(
+        min=0,
+        max=100,
+        value=85,  # Comfortable default volume
+        divisions=10,
+        label="Volume: {value}%",
+        on_change=change_volume,
+        disabled=not tts_manager.is_available,
+        active_color="#2196F3",
+        thumb_color="#1976D2"
+    )
     
     # TTS Controls Panel - Optimized for neurodivergent users
     tts_controls = ft.Container(
+        # Nested column spacing gives the 8/12 px gaps without spacer controls
         content=ft.Column([
-            ft.Row([
-                ft.Icon(ft.Icons.RECORD_VOICE_OVER, color="#1976D2", size=20),
-                ft.Text("🎤 Read Aloud", size=16, weight="bold", color="#1976D2"),
-            ]),
-            ft.Container(height=8),
-            
-            # Main controls row - simplified to just play/pause and restart
-            ft.Row([
-                ft.IconButton(
-                    icon=ft.Icons.PLAY_ARROW,
-                    tooltip="Play/Pause speech",
-                    on_click=play_pause_speech,
-                    ref=play_pause_button,
-                    style=ft.ButtonStyle(
-                        color="#FFFFFF",
-                        bgcolor="#4CAF50",
-                        shape=ft.CircleBorder(),
-                        padding=12
-                    )
-                ),
-                ft.IconButton(
-                    icon=ft.Icons.RESTART_ALT,
-                    tooltip="Restart from beginning",
-                    on_click=restart_speech,
-                    ref=restart_button,
-                    style=ft.ButtonStyle(
-                        color="#FFFFFF",
-                        bgcolor="#2196F3",
-                        shape=ft.CircleBorder(),
-                        padding=12
-                    )
-                ),
-            ], alignment=ft.MainAxisAlignment.START),
-            
-            # Status with better spacing
-            ft.Container(height=8),
-            ft.Text(
-                "🔇 Ready to read aloud" if tts_manager.is_available else "❌ TTS not available",
-                size=12,
-                ref=tts_status,
-                color="#666666",
-                text_align=ft.TextAlign.CENTER
-            ),
-            
-            ft.Container(height=12),
+            ft.Column([
+                ft.Row([
+                    ft.Icon(ft.Icons.RECORD_VOICE_OVER, color="#1976D2", size=20),
+                    ft.Text("🎤 Read Aloud", size=16, weight="bold", color="#1976D2"),
+                ]),
+                
+                # Main controls row - simplified to just play/pause and restart
+                ft.Row([
+                    st.play_btn,
+                    st.restart_btn,
+                ], alignment=ft.MainAxisAlignment.START),
+                
+                # Status line
+                st.status,
+            ], spacing=8),
             
             # Voice selection with better labeling
             ft.Column([
                 ft.Text("🎭 Voice Selection:", size=13, weight="w600", color="#1976D2"),
-                ft.Container(height=4),
-                ft.Dropdown(
-                    options=voice_options,
-                    value=default_voice,
-                    on_change=change_voice,
-                    ref=voice_dropdown,
-                    disabled=not tts_manager.is_available,
-                    text_size=12,
-                    content_padding=10,
-                    border_radius=8,
-                    hint_text="Choose voice..."
-                )
-            ], spacing=0),
-            
-            ft.Container(height=12),
+                st.voice_dropdown
+            ], spacing=4),
             
-            # Speed control with neurodivergent-friendly range
             ft.Column([
-                ft.Text("🐌 Reading Speed:", size=13, weight="w600", color="#1976D2"),
-                ft.Container(height=4),
-                ft.Slider(
-                    min=-4,
-                    max=2,
-                    value=-2,  # Default slower speed for neurodivergent users
-                    divisions=6,
-                    label="Speed: {value}",
-                    on_change=change_rate,
-                    ref=rate_slider,
-                    disabled=not tts_manager.is_available,
-                    active_color="#2196F3",
-                    thumb_color="#1976D2"
-                )
-            ], spacing=0),
-            
-            ft.Container(height=8),
+                # Speed control with neurodivergent-friendly range
+                ft.Column([
+                    ft.Text("🐌 Reading Speed:", size=13, weight="w600", color="#1976D2"),
+                    st.rate_slider
+                ], spacing=4),
+                
+                # Volume control
+                ft.Column([
+                    ft.Text("🔊 Volume:", size=13, weight="w600", color="#1976D2"),
+                    st.volume_slider
+                ], spacing=4),
+            ], spacing=8),
             
-            # Volume control
             ft.Column([
-                ft.Text("🔊 Volume:", size=13, weight="w600", color="#1976D2"),
-                ft.Container(height=4),
-                ft.Slider(
-                    min=0,
-                    max=100,
-                    value=85,  # Comfortable default volume
-                    divisions=10,
-                    label="Volume: {value}%",
-                    on_change=change_volume,
-                    ref=volume_slider,
-                    disabled=not tts_manager.is_available,
-                    active_color="#2196F3",
-                    thumb_color="#1976D2"
-                )
-            ], spacing=0),
-            
-            ft.Container(height=12),
-            
-            # Voice information display
-            ft.Container(
-                content=ft.Column([
-                    ft.Text(
-                        "ℹ️ Voice Guide:",
-                        size=12,
-                        weight="w600",
-                        color="#1976D2"
-                    ),
-                    ft.Text(
-                        "🌟 = Recommended for neurodivergent users\n👩 = Female voice | 👨 = Male voice\n🎙️ = Standard quality voice",
+                # Voice information display
+                ft.Container(
+                    content=ft.Column([
+                        ft.Text(
+                            "ℹ️ Voice Guide:",
+                            size=12,
+                            weight="w600",
+                            color="#1976D2"
+                        ),
+                        ft.Text(
+                            "🌟 = Recommended for neurodivergent users\n👩 = Female voice | 👨 = Male voice\n🎙️ = Standard quality voice",
+                            size=10,
+                            color="#666666",
+                            text_align=ft.TextAlign.LEFT
+                        )
+                    ], spacing=4),
+                    padding=8,
+                    bgcolor=_BG_INFO,
+                    border_radius=8
+                ),
+                
+                # Helpful tip for neurodivergent users
+                ft.Container(
+                    content=ft.Text(
+                        "💡 Tip: Try different voices and speeds to find what works best for you!",
                         size=10,
                         color="#666666",
-                        text_align=ft.TextAlign.LEFT
-                    )
-                ], spacing=4),
-                padding=8,
-                bgcolor=ft.Colors.with_opacity(0.05, "#2196F3"),
-                border_radius=8
-            ),
-            
-            ft.Container(height=8),
-            
-            # Helpful tip for neurodivergent users
-            ft.Container(
-                content=ft.Text(
-                    "💡 Tip: Try different voices and speeds to find what works best for you!",
-                    size=10,
-                    color="#666666",
-                    text_align=ft.TextAlign.CENTER,
-                    italic=True
-                ),
-                padding=8,
-                bgcolor=ft.Colors.with_opacity(0.05, "#1976D2"),
-                border_radius=8
-            )
-        ], spacing=0),
+                        text_align=ft.TextAlign.CENTER,
+                        italic=True
+                    ),
+                    padding=8,
+                    bgcolor=_BG_TIP,
+                    border_radius=8
+                )
+            ], spacing=8)
+        ], spacing=12),
         padding=20,
         bgcolor="#F8F9FA" if theme_mode == ft.ThemeMode.LIGHT else "#383838",
         border_radius=12,
@@ -378,7 +443,7 @@ def create_tts_controls_panel(
         shadow=ft.BoxShadow(
             spread_radius=0,
             blur_radius=4,
-            color=ft.Colors.with_opacity(0.1, "#1976D2"),
+            color=_SHADOW,
             offset=ft.Offset(0, 2),
         )
     )
@@ -406,7 +471,7 @@ def create_tts_unavailable_panel(theme_mode: ft.ThemeMode) -> ft.Container:
                     text_align=ft.TextAlign.CENTER
                 ),
                 padding=8,
-                bgcolor=ft.Colors.with_opacity(0.05, "#999999"),
+                bgcolor=_BG_UNAVAILABLE,
                 border_radius=8
             )
         ], spacing=5),
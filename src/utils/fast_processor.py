@@ -4,9 +4,11 @@ For basic file operations that don't need full DI overhead
 """
 
 import os
+import stat
 import time
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 
 def fast_extract_text_content(file_path: str) -> str:
     """Fast text extraction without DI overhead"""
@@ -32,16 +34,41 @@ def fast_extract_text_content(file_path: str) -> str:
     except Exception as e:
         return f"Could not extract text content: {e}"
 
-def fast_file_validation(file_path: str) -> Dict[str, Any]:
-    """Fast file validation without DI"""
+def fast_read_preview(file_path: str, max_chars: int = 8192) -> Tuple[str, bool]:
+    """
+    Read at most max_chars characters from the start of a text file
+    
+    Returns:
+        (content, truncated) - truncated is True when the file has more text than was read
+    """
+    try:
+        # UTF-8 is at most 4 bytes per character; one extra byte tells whether more follows
+        max_bytes = max_chars * 4
+        with open(file_path, 'rb') as f:
+            raw = f.read(max_bytes + 1)
+        content = raw[:max_bytes].decode('utf-8', errors='ignore')
+        truncated = len(raw) > max_bytes or len(content) > max_chars
+        content = content[:max_chars]
+        if Path(file_path).suffix.lower() == '.py':
+            # Add simple Python context (as fast_extract_text_content does)
+            content = f"Python source code file:\n\n{content}"
+        return content, truncated
+    except Exception as e:
+        return f"Could not extract text content: {e}", False
+
+def fast_file_validation(file_path: str, stat_result: Optional[os.stat_result] = None) -> Dict[str, Any]:
+    """Fast file validation without DI (pass stat_result to skip the stat call)"""
     try:
-        if not os.path.exists(file_path):
-            return {"valid": False, "error": "File not found"}
+        if stat_result is None:
+            try:
+                stat_result = os.stat(file_path)
+            except FileNotFoundError:
+                return {"valid": False, "error": "File not found"}
         
-        if not os.path.isfile(file_path):
+        if not stat.S_ISREG(stat_result.st_mode):
             return {"valid": False, "error": "Path is not a file"}
         
-        file_size = os.path.getsize(file_path)
+        file_size = stat_result.st_size
         if file_size > 100 * 1024 * 1024:  # 100MB limit
             return {"valid": False, "error": "File too large (>100MB)"}
         
@@ -54,30 +81,53 @@ def fast_file_validation(file_path: str) -> Dict[str, Any]:
     except Exception as e:
         return {"valid": False, "error": str(e)}
 
+TEXT_EXTENSIONS = frozenset({'.txt', '.md', '.py', '.js', '.html', '.css', '.json', '.xml', '.csv'})
+AUDIO_EXTENSIONS = frozenset({'.mp3', '.wav', '.flac', '.aac', '.m4a', '.ogg', '.wma'})
+VIDEO_EXTENSIONS = frozenset({'.mp4', '.avi', '.mov', '.mkv', '.wmv'})
+
+@lru_cache(maxsize=512)
+def _classify_suffix(suffix: str) -> str:
+    """File kind for a lowercase suffix"""
+    if suffix in TEXT_EXTENSIONS:
+        return "text"
+    if suffix in AUDIO_EXTENSIONS:
+        return "audio"
+    if suffix in VIDEO_EXTENSIONS:
+        return "video"
+    return "binary"
+
+def classify_file(file_path: str) -> str:
+    """Classify a file by extension as 'text', 'audio', 'video' or 'binary'"""
+    return _classify_suffix(Path(file_path).suffix.lower())
+
 def is_text_file(file_path: str) -> bool:
     """Quick check if file is likely text-based"""
-    text_extensions = {'.txt', '.md', '.py', '.js', '.html', '.css', '.json', '.xml', '.csv'}
-    return Path(file_path).suffix.lower() in text_extensions
+    return classify_file(file_path) == "text"
 
 def is_audio_file(file_path: str) -> bool:
     """Quick check if file is an audio file"""
-    audio_extensions = {'.mp3', '.wav', '.flac', '.aac', '.m4a', '.ogg', '.wma'}
-    return Path(file_path).suffix.lower() in audio_extensions
+    return classify_file(file_path) == "audio"
 
 def is_video_file(file_path: str) -> bool:
     """Quick check if file is a video file"""
-    video_extensions = {'.mp4', '.avi', '.mov', '.mkv', '.wmv'}
-    return Path(file_path).suffix.lower() in video_extensions
+    return classify_file(file_path) == "video"
 
-def create_quick_summary(content: str, file_path: str) -> Dict[str, Any]:
-    """Create a quick summary without AI when AI is not available"""
+def create_quick_summary(content: str, file_path: str, file_size: Optional[int] = None,
+                         partial: bool = False) -> Dict[str, Any]:
+    """
+    Create a quick summary without AI when AI is not available (file_size skips a stat)
+    
+    partial marks text content as a preview of a longer file (see fast_read_preview).
+    """
     file_name = Path(file_path).name
     file_ext = Path(file_path).suffix.lower()
+    kind = _classify_suffix(file_ext)
     
     # Handle audio files
-    if is_audio_file(file_path):
+    if kind == "audio":
         try:
-            file_size = os.path.getsize(file_path)
+            if file_size is None:
+                file_size = os.path.getsize(file_path)
             size_mb = file_size / (1024 * 1024)
             
             return {
@@ -103,9 +153,10 @@ def create_quick_summary(content: str, file_path: str) -> Dict[str, Any]:
             }
     
     # Handle video files  
-    if is_video_file(file_path):
+    if kind == "video":
         try:
-            file_size = os.path.getsize(file_path)
+            if file_size is None:
+                file_size = os.path.getsize(file_path)
             size_mb = file_size / (1024 * 1024)
             
             return {
@@ -138,6 +189,21 @@ def create_quick_summary(content: str, file_path: str) -> Dict[str, Any]:
     word_count = len(content.split())
     char_count = len(content)
     
+    # A bounded preview only covers the start of larger files - say so instead of guessing totals
+    if partial:
+        if file_size is None:
+            file_size = os.path.getsize(file_path)
+        return {
+            "tldr": f"Text file '{file_name}' ({file_size:,} bytes) - preview of the first {char_count:,} characters has {word_count:,} words and {len(lines):,} lines.",
+            "bullets": [
+                f"📄 File: {file_name}",
+                f"📏 Size: {file_size:,} bytes",
+                f"📊 Preview: {word_count:,} words, {len(lines):,} lines (partial)",
+                "📝 Content type: Text document"
+            ],
+            "paragraph": f"This is a text document named '{file_name}' with a size of {file_size:,} bytes. Only the first {char_count:,} characters were read for this quick view, so the {word_count:,} words across {len(lines):,} lines cover part of the file. Preview: {content_preview[:200]}..."
+        }
+    
     return {
         "tldr": f"Text file '{file_name}' with {word_count} words and {len(lines)} lines.",
         "bullets": [
@@ -0,0 +1,59 @@
+"""
+Tests for OllamaService summary formatting
+"""
+
+import pytest
+
+from src.service.ollama_service import OllamaService
+
+
+@pytest.fixture
+def service():
+    # _format_summary needs no config - skip the Ollama client setup
+    return object.__new__(OllamaService)
+
+
+@pytest.mark.parametrize("line, expected", [
+    ("- item", "• item"),
+    ("-item", "• item"),
+    ("* item", "• item"),
+    ("•item", "• item"),
+    ("• already normalized", "• already normalized"),
+])
+def test_bullet_markers_normalized(service, line, expected):
+    assert service._format_summary(line) == expected
+
+
+def test_bold_after_bullet_kept(service):
+    assert service._format_summary("• **Key term**: explanation") == "• **Key term**: explanation"
+    assert service._format_summary("- **Key term**: explanation") == "• **Key term**: explanation"
+
+
+def test_emphasis_at_line_start_is_not_a_bullet(service):
+    assert service._format_summary("**TL;DR:** Short summary") == "**TL;DR:** Short summary"
+    assert service._format_summary("*italic* text") == "*italic* text"
+
+
+def test_lines_stripped_and_blanks_dropped(service):
+    assert service._format_summary("  first  \n\n   - second \n") == "first\n• second"
+
+
+def test_numba_path_matches_regex(service):
+    pytest.importorskip("numba")
+    from src.service import ollama_service
+
+    lines = ["**KEY POINTS:**", "- item", "* **Bold**: text", "*italic* text", "• done", "•tight", "-\tTab"]
+    text = "\n".join(lines * (ollama_service._NUMBA_FORMAT_THRESHOLD // 40))
+    assert len(text) > ollama_service._NUMBA_FORMAT_THRESHOLD
+    assert service._format_summary(text) == ollama_service._BULLET_NORM_RE.sub('• ', text)
+
+
+def test_stream_normalizes_only_key_points(service, monkeypatch):
+    text = "**TL;DR:** Short\n*italic* intro\n**KEY POINTS:**\n- a\n* **B**: c\n**FULL SUMMARY:**\n- dash prose\n"
+    monkeypatch.setattr(service, "_stream_chat", lambda *args, **kwargs: iter([text[:7], text[7:30], text[30:]]))
+
+    lines = "".join(service.generate_summary_stream("content", None)).splitlines()
+    assert lines == [
+        "**TL;DR:** Short", "*italic* intro", "**KEY POINTS:**",
+        "• a", "• **B**: c", "**FULL SUMMARY:**", "- dash prose",
+    ]